@@ -4,6 +4,11 @@ from __future__ import annotations
 
 from typing import Any
 
+# Fixed fragments of formatted warnings; match on these rather than on full text
+NEGATIVE_DENOMINATOR = "Negative denominator"
+CURRENCY_MISMATCH = "cannot mix currencies"
+CROSS_CHECK_DIVERGENCE = "differs from reported"
+
 
 def extract_sec_value(sec_metrics: dict[str, Any], key: str) -> tuple[float | None, Any]:
     """Extract a numeric value and its source object from sec_metrics.
@@ -89,8 +94,7 @@ def detect_sec_currency(
 def cross_currency_warning(sec_currency: str, context: str) -> str:
     """Generate a consistent cross-currency warning message."""
     return (
-        f"SEC data is in {sec_currency} but market data is in USD; "
-        f"cannot mix currencies in {context}"
+        f"SEC data is in {sec_currency} but market data is in USD; {CURRENCY_MISMATCH} in {context}"
     )
 
 
@@ -110,7 +114,7 @@ def _cross_check(
     rel_diff = abs(computed - reported) / abs(reported)
     if rel_diff > tolerance:
         return (
-            f"{metric_name}: computed ({computed:,.0f}) differs from reported "
+            f"{metric_name}: computed ({computed:,.0f}) {CROSS_CHECK_DIVERGENCE} "
             f"({reported:,.0f}) by {rel_diff:.1%}"
         )
     return None
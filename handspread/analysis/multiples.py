@@ -6,6 +6,7 @@ from typing import Any
 
 from ..models import ComputedValue, EVBridge, MarketSnapshot
 from ._utils import (
+    NEGATIVE_DENOMINATOR,
     compute_adjusted_ebitda,
     compute_free_cash_flow,
     cross_currency_warning,
@@ -61,7 +62,7 @@ def _safe_divide(
             warnings=warnings,
         )
     if denominator_val < 0:
-        warnings.append(f"Negative denominator ({denominator_val}); result may be misleading")
+        warnings.append(f"{NEGATIVE_DENOMINATOR} ({denominator_val}); result may be misleading")
 
     return ComputedValue(
         metric=metric,
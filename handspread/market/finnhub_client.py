@@ -16,13 +16,21 @@ from ..models import ComputedValue, MarketSnapshot, MarketValue
 # Module-level cache: (endpoint, symbol) -> (fetched_epoch, payload)
 _cache: dict[tuple[str, str], tuple[float, dict]] = {}
 _semaphore: asyncio.Semaphore | None = None
+_semaphore_loop: asyncio.AbstractEventLoop | None = None
 _client: finnhub.Client | None = None
 
 
 def _get_semaphore() -> asyncio.Semaphore:
-    global _semaphore
-    if _semaphore is None:
+    """Return the concurrency semaphore for the running event loop.
+
+    asyncio primitives bind to the loop that first waits on them, so a semaphore
+    left over from a previous loop (a prior asyncio.run or test) is replaced.
+    """
+    global _semaphore, _semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _semaphore is None or _semaphore_loop is not loop:
         _semaphore = asyncio.Semaphore(get_settings().market_concurrency)
+        _semaphore_loop = loop
     return _semaphore
 
 
@@ -306,9 +314,17 @@ async def fetch_market_snapshots(
     return output
 
 
-def clear_cache() -> None:
-    """Clear the in-memory TTL cache and client. Useful for testing."""
-    global _client, _semaphore
+def reset_state() -> None:
+    """Reset all module state: TTL cache, client, and concurrency semaphore."""
+    global _client, _semaphore, _semaphore_loop
+    if not _cache and _client is None and _semaphore is None:
+        return
     _cache.clear()
     _client = None
     _semaphore = None
+    _semaphore_loop = None
+
+
+def clear_cache() -> None:
+    """Clear the in-memory TTL cache and client. Alias for reset_state()."""
+    reset_state()
@@ -0,0 +1,65 @@
+"""Shared fixtures for analysis tests."""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from handspread.models import ComputedValue, MarketSnapshot, MarketValue
+
+_FIXED_NOW = datetime(2025, 1, 15, 12, 0, tzinfo=UTC)
+
+
+def _make_snapshot(price=100.0, shares=1_000_000):
+    # Inputs are known-good, so skip pydantic validation via model_construct
+    p = MarketValue.model_construct(
+        metric="price",
+        value=price,
+        unit="USD",
+        vendor="finnhub",
+        symbol="TEST",
+        endpoint="quote",
+        fetched_at=_FIXED_NOW,
+    )
+    s = MarketValue.model_construct(
+        metric="shares_outstanding",
+        value=shares,
+        unit="shares",
+        vendor="finnhub",
+        symbol="TEST",
+        endpoint="profile",
+        fetched_at=_FIXED_NOW,
+    )
+    mcap_val = price * shares if price and shares else None
+    mcap = ComputedValue.model_construct(
+        metric="market_cap",
+        value=mcap_val,
+        unit="USD",
+        formula="price * shares_outstanding",
+    )
+    return MarketSnapshot.model_construct(
+        symbol="TEST",
+        company_name="Test Corp",
+        price=p,
+        shares_outstanding=s,
+        market_cap=mcap,
+    )
+
+
+@pytest.fixture(scope="module")
+def default_snapshot():
+    """Shared price=100, shares=1M snapshot. Analysis functions only read it."""
+    return _make_snapshot()
+
+
+@pytest.fixture(scope="module")
+def snapshot_factory():
+    """Return a builder that reuses one snapshot per (price, shares) pair."""
+    cache: dict[tuple[float, float], MarketSnapshot] = {}
+
+    def make(price=100.0, shares=1_000_000):
+        key = (price, shares)
+        if key not in cache:
+            cache[key] = _make_snapshot(price, shares)
+        return cache[key]
+
+    return make
@@ -76,7 +76,6 @@ MARKET_PATCH = "handspread.engine.fetch_market_snapshots"
 
 
 class TestAllStreamsFail:
-    @pytest.mark.asyncio
     async def test_all_streams_fail(self):
         """When all three data streams raise, CompanyAnalysis has errors but no crash."""
         with (
@@ -95,7 +94,6 @@ class TestAllStreamsFail:
 
 
 class TestSecOnlyFail:
-    @pytest.mark.asyncio
     async def test_sec_only_fail(self):
         """Market works, SEC fails. Partial analysis with market data + error."""
         snapshot = _make_snapshot(symbol="NVDA", company_name="NVIDIA Corporation")
@@ -113,7 +111,6 @@ class TestSecOnlyFail:
 
 
 class TestMarketOnlyFail:
-    @pytest.mark.asyncio
     async def test_market_only_fail(self):
         """SEC works, market fails. SEC data present, no EV bridge."""
         qr = _make_query_result("NVDA", company="NVIDIA Corp", cik="0001045810")
@@ -131,7 +128,6 @@ class TestMarketOnlyFail:
 
 
 class TestBuildSinglePopulatesName:
-    @pytest.mark.asyncio
     async def test_name_from_sec_takes_priority(self):
         """Company name resolution: SEC name > market name > ticker fallback."""
         qr = _make_query_result("NVDA", company="NVIDIA Corporation", cik="0001045810")
@@ -145,7 +141,6 @@ class TestBuildSinglePopulatesName:
         # SEC name takes priority over market name
         assert results[0].company_name == "NVIDIA Corporation"
 
-    @pytest.mark.asyncio
     async def test_name_falls_back_to_market(self):
         """When SEC result is None, uses market company_name."""
         snapshot = _make_snapshot(symbol="NVDA", company_name="NVIDIA Corp")
@@ -159,7 +154,6 @@ class TestBuildSinglePopulatesName:
 
 
 class TestValuationTimestamp:
-    @pytest.mark.asyncio
     async def test_valuation_timestamp_set(self):
         """Verify valuation_timestamp is set to roughly now (UTC)."""
         qr = _make_query_result("NVDA")
@@ -178,7 +172,6 @@ class TestValuationTimestamp:
 
 
 class TestTimeoutHandling:
-    @pytest.mark.asyncio
     async def test_timeout_returns_per_company_errors(self):
         """Timeout should return per-company results with SEC and market errors."""
         with patch("handspread.engine.asyncio.wait_for", side_effect=TimeoutError):
@@ -192,7 +185,6 @@ class TestTimeoutHandling:
 
 
 class TestInputValidation:
-    @pytest.mark.asyncio
     async def test_empty_tickers_raises(self):
         with pytest.raises(ValueError, match="at least one symbol"):
             await analyze_comps([])
@@ -1,14 +1,17 @@
 """Tests for the Finnhub market data client."""
 
+import asyncio
 from datetime import UTC, datetime
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from handspread.market.finnhub_client import (
-    clear_cache,
+    _get_semaphore,
     fetch_market_snapshot,
     fetch_market_snapshots,
+    reset_state,
 )
 from handspread.models import ComputedValue, MarketSnapshot, MarketValue
 
@@ -25,37 +28,33 @@ def _mock_client(quote=None, profile=None, metric=None):
     return client
 
 
-def _mock_settings():
-    """Build a mock Settings object with default test values."""
-    s = MagicMock()
-    s.finnhub_api_key = "test-key"
-    s.market_ttl_seconds = 300
-    s.market_concurrency = 8
-    s.store_raw_market_payload = False
-    return s
+# Fixed fetch timestamp for snapshots built by helpers; datetimes are immutable
+_FIXED_NOW = datetime(2024, 1, 1, tzinfo=UTC)
+
+# Read-only stand-in for Settings, shared by every test that patches get_settings
+_DEFAULT_SETTINGS = SimpleNamespace(
+    finnhub_api_key="test-key",
+    market_ttl_seconds=300,
+    market_concurrency=8,
+    store_raw_market_payload=False,
+)
 
 
 @pytest.fixture(autouse=True)
 def _clean_state():
-    """Clear module-level cache and reset semaphore before each test."""
-    clear_cache()
-    # Reset the module-level semaphore so each test gets a fresh one
-    import handspread.market.finnhub_client as mod
-
-    mod._semaphore = None
+    """Reset module-level cache, client, and semaphore around each test."""
+    reset_state()
     yield
-    clear_cache()
-    mod._semaphore = None
+    reset_state()
 
 
 class TestSnapshotBasic:
-    @pytest.mark.asyncio
     async def test_snapshot_basic(self):
         """Mock quote + profile + metric, verify MarketSnapshot fields."""
         client = _mock_client()
         with (
             patch("handspread.market.finnhub_client._get_client", return_value=client),
-            patch("handspread.market.finnhub_client.get_settings", return_value=_mock_settings()),
+            patch("handspread.market.finnhub_client.get_settings", return_value=_DEFAULT_SETTINGS),
         ):
             snap = await fetch_market_snapshot("TEST")
 
@@ -66,13 +65,12 @@ class TestSnapshotBasic:
 
 
 class TestSharesMillionsConversion:
-    @pytest.mark.asyncio
     async def test_shares_millions_conversion(self):
         """Profile returns 24.3 (millions), verify * 1_000_000."""
         client = _mock_client(profile={"shareOutstanding": 24.3, "name": "X"})
         with (
             patch("handspread.market.finnhub_client._get_client", return_value=client),
-            patch("handspread.market.finnhub_client.get_settings", return_value=_mock_settings()),
+            patch("handspread.market.finnhub_client.get_settings", return_value=_DEFAULT_SETTINGS),
         ):
             snap = await fetch_market_snapshot("TEST")
 
@@ -80,7 +78,6 @@ class TestSharesMillionsConversion:
 
 
 class TestSharesFallbackToMetric:
-    @pytest.mark.asyncio
     async def test_shares_fallback_to_metric(self):
         """Profile returns None for shares, metric endpoint has it."""
         client = _mock_client(
@@ -89,7 +86,7 @@ class TestSharesFallbackToMetric:
         )
         with (
             patch("handspread.market.finnhub_client._get_client", return_value=client),
-            patch("handspread.market.finnhub_client.get_settings", return_value=_mock_settings()),
+            patch("handspread.market.finnhub_client.get_settings", return_value=_DEFAULT_SETTINGS),
         ):
             snap = await fetch_market_snapshot("TEST")
 
@@ -98,13 +95,12 @@ class TestSharesFallbackToMetric:
 
 
 class TestCacheHit:
-    @pytest.mark.asyncio
     async def test_cache_hit(self):
         """Call twice, verify second call doesn't invoke client methods again."""
         client = _mock_client()
         with (
             patch("handspread.market.finnhub_client._get_client", return_value=client),
-            patch("handspread.market.finnhub_client.get_settings", return_value=_mock_settings()),
+            patch("handspread.market.finnhub_client.get_settings", return_value=_DEFAULT_SETTINGS),
         ):
             await fetch_market_snapshot("CACHE_TEST")
             initial_quote_calls = client.quote.call_count
@@ -115,12 +111,10 @@ class TestCacheHit:
 
 
 class TestCacheExpiry:
-    @pytest.mark.asyncio
     async def test_cache_expiry(self):
         """Set TTL to 0, verify cache miss forces re-fetch."""
         client = _mock_client()
-        settings = _mock_settings()
-        settings.market_ttl_seconds = 0
+        settings = SimpleNamespace(**{**vars(_DEFAULT_SETTINGS), "market_ttl_seconds": 0})
         with (
             patch("handspread.market.finnhub_client._get_client", return_value=client),
             patch("handspread.market.finnhub_client.get_settings", return_value=settings),
@@ -132,8 +126,26 @@ class TestCacheExpiry:
         assert client.quote.call_count >= 2
 
 
+class TestSemaphorePerEventLoop:
+    def test_semaphore_rebuilt_for_new_loop(self):
+        """A semaphore from a finished event loop must not leak into the next one."""
+
+        async def grab():
+            return _get_semaphore()
+
+        with patch("handspread.market.finnhub_client.get_settings", return_value=_DEFAULT_SETTINGS):
+            first = asyncio.run(grab())
+            second = asyncio.run(grab())
+
+        assert first is not second
+
+    async def test_semaphore_reused_within_loop(self):
+        """Calls on the same loop share one semaphore so the bound holds."""
+        with patch("handspread.market.finnhub_client.get_settings", return_value=_DEFAULT_SETTINGS):
+            assert _get_semaphore() is _get_semaphore()
+
+
 class TestNegativeSharesWarning:
-    @pytest.mark.asyncio
     async def test_negative_shares_warning(self):
         """Mock negative shares, verify warning added and shares treated as None."""
         client = _mock_client(
@@ -142,7 +154,7 @@ class TestNegativeSharesWarning:
         )
         with (
             patch("handspread.market.finnhub_client._get_client", return_value=client),
-            patch("handspread.market.finnhub_client.get_settings", return_value=_mock_settings()),
+            patch("handspread.market.finnhub_client.get_settings", return_value=_DEFAULT_SETTINGS),
         ):
             snap = await fetch_market_snapshot("BAD")
 
@@ -151,7 +163,6 @@ class TestNegativeSharesWarning:
 
 
 class TestNonPositivePriceWarning:
-    @pytest.mark.asyncio
     async def test_zero_price_treated_as_none(self):
         """Zero price should be treated as missing to avoid nonsense market cap."""
         client = _mock_client(
@@ -160,7 +171,7 @@ class TestNonPositivePriceWarning:
         )
         with (
             patch("handspread.market.finnhub_client._get_client", return_value=client),
-            patch("handspread.market.finnhub_client.get_settings", return_value=_mock_settings()),
+            patch("handspread.market.finnhub_client.get_settings", return_value=_DEFAULT_SETTINGS),
         ):
             snap = await fetch_market_snapshot("ZERO")
 
@@ -168,7 +179,6 @@ class TestNonPositivePriceWarning:
         assert snap.market_cap.value is None
         assert any("Negative or zero price" in w for w in snap.price.warnings)
 
-    @pytest.mark.asyncio
     async def test_non_numeric_price_treated_as_none(self):
         """Malformed price should be treated as missing, not crash."""
         client = _mock_client(
@@ -177,7 +187,7 @@ class TestNonPositivePriceWarning:
         )
         with (
             patch("handspread.market.finnhub_client._get_client", return_value=client),
-            patch("handspread.market.finnhub_client.get_settings", return_value=_mock_settings()),
+            patch("handspread.market.finnhub_client.get_settings", return_value=_DEFAULT_SETTINGS),
         ):
             snap = await fetch_market_snapshot("BADPRICE")
 
@@ -189,205 +199,174 @@ class TestNonPositivePriceWarning:
 class TestMarketCapFromProfile:
     """Vendor-provided market cap from profile endpoint should take precedence."""
 
-    @pytest.mark.asyncio
-    async def test_vendor_market_cap_used(self):
-        """Profile returns marketCapitalization; verify it's used instead of price * shares."""
-        client = _mock_client(
-            profile={
-                "shareOutstanding": 25900.0,  # ADR: 25.9B ordinary shares
-                "marketCapitalization": 950000,  # $950B in millions
-                "name": "TSM Corp",
-            },
-            quote={"c": 200.0, "t": 1700000000},
-        )
-        with (
-            patch("handspread.market.finnhub_client._get_client", return_value=client),
-            patch("handspread.market.finnhub_client.get_settings", return_value=_mock_settings()),
-        ):
-            snap = await fetch_market_snapshot("TSM")
-
-        # Should use vendor market cap (950000M = $950B), NOT 200 * 25.9B = $5.18T
-        assert snap.market_cap.value == 950_000_000_000
-        assert isinstance(snap.market_cap, MarketValue)
-        assert snap.market_cap.endpoint == "profile"
-
-    @pytest.mark.asyncio
-    async def test_vendor_market_cap_missing_falls_back(self):
-        """Profile omits marketCapitalization; verify fallback to price * shares."""
-        client = _mock_client(
-            profile={"shareOutstanding": 24.3, "name": "Test Corp"},
-        )
+    @pytest.mark.parametrize(
+        "profile,quote,expected_type,expected_value,expected_endpoint",
+        [
+            pytest.param(
+                # ADR: 25.9B ordinary shares, $950B vendor mcap (in millions).
+                # Must use vendor value, NOT 200 * 25.9B = $5.18T
+                {"shareOutstanding": 25900.0, "marketCapitalization": 950000, "name": "TSM Corp"},
+                {"c": 200.0, "t": 1700000000},
+                MarketValue,
+                950_000_000_000,
+                "profile",
+                id="vendor_market_cap_used",
+            ),
+            pytest.param(
+                {"shareOutstanding": 24.3, "name": "Test Corp"},
+                None,
+                ComputedValue,
+                150.0 * 24_300_000,
+                None,
+                id="vendor_market_cap_missing_falls_back",
+            ),
+            pytest.param(
+                {"shareOutstanding": 10.0, "marketCapitalization": 0, "name": "Zero MCap Corp"},
+                None,
+                ComputedValue,
+                150.0 * 10_000_000,
+                None,
+                id="vendor_market_cap_zero_falls_back",
+            ),
+        ],
+    )
+    async def test_vendor_market_cap_precedence(
+        self, profile, quote, expected_type, expected_value, expected_endpoint
+    ):
+        """Valid vendor mcap wins; missing or zero falls back to price * shares."""
+        client = _mock_client(profile=profile, quote=quote)
         with (
             patch("handspread.market.finnhub_client._get_client", return_value=client),
-            patch("handspread.market.finnhub_client.get_settings", return_value=_mock_settings()),
+            patch("handspread.market.finnhub_client.get_settings", return_value=_DEFAULT_SETTINGS),
         ):
             snap = await fetch_market_snapshot("TEST")
 
-        expected_mcap = 150.0 * 24_300_000
-        assert snap.market_cap.value == expected_mcap
-        assert isinstance(snap.market_cap, ComputedValue)
-
-    @pytest.mark.asyncio
-    async def test_vendor_market_cap_zero_falls_back(self):
-        """Profile returns marketCapitalization=0; should fall back to computed."""
-        client = _mock_client(
-            profile={
-                "shareOutstanding": 10.0,
-                "marketCapitalization": 0,
-                "name": "Zero MCap Corp",
-            },
-        )
-        with (
-            patch("handspread.market.finnhub_client._get_client", return_value=client),
-            patch("handspread.market.finnhub_client.get_settings", return_value=_mock_settings()),
-        ):
-            snap = await fetch_market_snapshot("ZERO_MCAP")
-
-        assert isinstance(snap.market_cap, ComputedValue)
-        expected_mcap = 150.0 * 10_000_000
-        assert snap.market_cap.value == expected_mcap
+        assert isinstance(snap.market_cap, expected_type)
+        assert snap.market_cap.value == expected_value
+        if expected_endpoint is not None:
+            assert snap.market_cap.endpoint == expected_endpoint
 
 
 class TestVendorMcapCurrencyCrossCheck:
     """Vendor market cap should be rejected when profile currency is non-USD and value diverges."""
 
-    @pytest.mark.asyncio
-    async def test_non_usd_currency_high_ratio_falls_back(self):
-        """TSM-like: currency=TWD, vendor mcap is 5x computed -> fall back to computed."""
-        client = _mock_client(
-            profile={
-                "shareOutstanding": 25900.0,  # 25.9B shares (ordinary)
-                "marketCapitalization": 49000000,  # 49T TWD in millions
-                "name": "TSM Corp",
-                "currency": "TWD",
-            },
-            quote={"c": 200.0, "t": 1700000000},
-        )
-        with (
-            patch("handspread.market.finnhub_client._get_client", return_value=client),
-            patch("handspread.market.finnhub_client.get_settings", return_value=_mock_settings()),
-        ):
-            snap = await fetch_market_snapshot("TSM")
-
-        # Should fall back to computed (price * shares) because vendor is in TWD
-        assert isinstance(snap.market_cap, ComputedValue)
-        expected = 200.0 * 25_900_000_000
-        assert snap.market_cap.value == expected
-        # Warning should mention non-USD denomination on the market_cap ComputedValue
-        assert any("non-USD" in w for w in snap.market_cap.warnings)
-
-    @pytest.mark.asyncio
-    async def test_non_usd_currency_reasonable_ratio_uses_vendor(self):
-        """BABA-like: currency=CNY, but vendor mcap is reasonable in USD -> use vendor."""
-        client = _mock_client(
-            profile={
-                "shareOutstanding": 2500.0,  # 2.5B shares
-                "marketCapitalization": 334000,  # $334B in millions
-                "name": "BABA Corp",
-                "currency": "CNY",
-            },
-            quote={"c": 130.0, "t": 1700000000},
-        )
-        with (
-            patch("handspread.market.finnhub_client._get_client", return_value=client),
-            patch("handspread.market.finnhub_client.get_settings", return_value=_mock_settings()),
-        ):
-            snap = await fetch_market_snapshot("BABA")
-
-        # Vendor mcap = 334B, computed = 130 * 2.5B = 325B, ratio ~1.03 -> use vendor
-        assert isinstance(snap.market_cap, MarketValue)
-        assert snap.market_cap.value == 334_000_000_000
-
-    @pytest.mark.asyncio
-    async def test_non_usd_vendor_smaller_than_computed_uses_vendor(self):
-        """BABA ADR case: vendor USD mcap ($334B) is much smaller than
-        computed ($3T) because computed uses ordinary shares * ADR price.
-        The vendor value is correct; should NOT fall back to computed."""
-        client = _mock_client(
-            profile={
-                "shareOutstanding": 19050.0,  # 19.05B ordinary shares
-                "marketCapitalization": 334000,  # $334B in millions (correct USD)
-                "name": "BABA Corp",
-                "currency": "CNY",
-            },
-            quote={"c": 155.0, "t": 1700000000},  # ADR price
-        )
-        with (
-            patch("handspread.market.finnhub_client._get_client", return_value=client),
-            patch("handspread.market.finnhub_client.get_settings", return_value=_mock_settings()),
-        ):
-            snap = await fetch_market_snapshot("BABA")
-
-        # Vendor = $334B, computed = 155 * 19.05B = $2.95T, ratio = 0.11
-        # Should still use vendor because vendor < computed means vendor is
-        # correct USD value and computed is ADR-inflated
-        assert isinstance(snap.market_cap, MarketValue)
-        assert snap.market_cap.value == 334_000_000_000
-
-    @pytest.mark.asyncio
-    async def test_usd_currency_any_ratio_uses_vendor(self):
-        """USD profile should always use vendor regardless of ratio."""
-        client = _mock_client(
-            profile={
-                "shareOutstanding": 100.0,
-                "marketCapitalization": 500000,
-                "name": "USD Corp",
-                "currency": "USD",
-            },
-            quote={"c": 100.0, "t": 1700000000},
-        )
-        with (
-            patch("handspread.market.finnhub_client._get_client", return_value=client),
-            patch("handspread.market.finnhub_client.get_settings", return_value=_mock_settings()),
-        ):
-            snap = await fetch_market_snapshot("TEST")
-
-        assert isinstance(snap.market_cap, MarketValue)
-        assert snap.market_cap.value == 500_000_000_000
-
-    @pytest.mark.asyncio
-    async def test_missing_currency_treated_as_usd(self):
-        """Profile without currency field should default to USD behavior."""
-        client = _mock_client(
-            profile={
-                "shareOutstanding": 100.0,
-                "marketCapitalization": 500000,
-                "name": "NoCurrency Corp",
-            },
-            quote={"c": 100.0, "t": 1700000000},
-        )
+    @pytest.mark.parametrize(
+        "profile,quote,expected_type,expected_value",
+        [
+            pytest.param(
+                # TSM-like: 49T TWD in millions is 5x computed -> fall back to computed
+                {
+                    "shareOutstanding": 25900.0,
+                    "marketCapitalization": 49000000,
+                    "name": "TSM Corp",
+                    "currency": "TWD",
+                },
+                {"c": 200.0, "t": 1700000000},
+                ComputedValue,
+                200.0 * 25_900_000_000,
+                id="non_usd_currency_high_ratio_falls_back",
+            ),
+            pytest.param(
+                # BABA-like: vendor $334B vs computed 130 * 2.5B = $325B, ratio ~1.03
+                {
+                    "shareOutstanding": 2500.0,
+                    "marketCapitalization": 334000,
+                    "name": "BABA Corp",
+                    "currency": "CNY",
+                },
+                {"c": 130.0, "t": 1700000000},
+                MarketValue,
+                334_000_000_000,
+                id="non_usd_currency_reasonable_ratio_uses_vendor",
+            ),
+            pytest.param(
+                # BABA ADR: computed = 155 * 19.05B ordinary shares = $2.95T, ratio 0.11.
+                # Vendor < computed means vendor is the correct USD value and
+                # computed is ADR-inflated, so vendor still wins
+                {
+                    "shareOutstanding": 19050.0,
+                    "marketCapitalization": 334000,
+                    "name": "BABA Corp",
+                    "currency": "CNY",
+                },
+                {"c": 155.0, "t": 1700000000},
+                MarketValue,
+                334_000_000_000,
+                id="non_usd_vendor_smaller_than_computed_uses_vendor",
+            ),
+            pytest.param(
+                {
+                    "shareOutstanding": 100.0,
+                    "marketCapitalization": 500000,
+                    "name": "USD Corp",
+                    "currency": "USD",
+                },
+                {"c": 100.0, "t": 1700000000},
+                MarketValue,
+                500_000_000_000,
+                id="usd_currency_any_ratio_uses_vendor",
+            ),
+            pytest.param(
+                {
+                    "shareOutstanding": 100.0,
+                    "marketCapitalization": 500000,
+                    "name": "NoCurrency Corp",
+                },
+                {"c": 100.0, "t": 1700000000},
+                MarketValue,
+                500_000_000_000,
+                id="missing_currency_treated_as_usd",
+            ),
+        ],
+    )
+    async def test_currency_cross_check(self, profile, quote, expected_type, expected_value):
+        """Non-USD vendor mcap is only rejected when it exceeds computed by more than 2x."""
+        client = _mock_client(profile=profile, quote=quote)
         with (
             patch("handspread.market.finnhub_client._get_client", return_value=client),
-            patch("handspread.market.finnhub_client.get_settings", return_value=_mock_settings()),
+            patch("handspread.market.finnhub_client.get_settings", return_value=_DEFAULT_SETTINGS),
         ):
             snap = await fetch_market_snapshot("TEST")
 
-        assert isinstance(snap.market_cap, MarketValue)
-        assert snap.market_cap.value == 500_000_000_000
+        assert isinstance(snap.market_cap, expected_type)
+        assert snap.market_cap.value == expected_value
+        if expected_type is ComputedValue:
+            # Fallback must explain the non-USD denomination on the market_cap value
+            assert any("non-USD" in w for w in snap.market_cap.warnings)
 
 
 class TestFetchSnapshotsPartialFailure:
-    @pytest.mark.asyncio
     async def test_partial_failure(self):
-        """One ticker succeeds, one raises. Dict has None for failed ticker."""
+        """Many tickers fan out concurrently; the failing one maps to None."""
+        tickers = [f"T{i}" for i in range(64)] + ["BAD"]
+        in_flight = 0
+        peak = 0
+
         with patch("handspread.market.finnhub_client.fetch_market_snapshot") as mock_single:
 
             async def side_effect(sym):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                # Simulated I/O: sequential awaits would never overlap here
+                await asyncio.sleep(0.01)
+                in_flight -= 1
                 if sym == "BAD":
                     raise RuntimeError("API error")
                 return await _make_snapshot_async(sym)
 
             mock_single.side_effect = side_effect
-            result = await fetch_market_snapshots(["GOOD", "BAD"])
+            result = await fetch_market_snapshots(tickers)
 
-        assert result["GOOD"] is not None
-        assert result["GOOD"].symbol == "GOOD"
+        assert peak == len(tickers)
+        assert list(result) == tickers
+        assert result["T0"].symbol == "T0"
+        assert all(result[t] is not None for t in tickers[:-1])
         assert result["BAD"] is None
 
 
 async def _make_snapshot_async(symbol):
     """Async helper to build a MarketSnapshot for the partial failure test."""
-    now = datetime.now(UTC)
     p = MarketValue(
         metric="price",
         value=100.0,
@@ -395,7 +374,7 @@ async def _make_snapshot_async(symbol):
         vendor="finnhub",
         symbol=symbol,
         endpoint="quote",
-        fetched_at=now,
+        fetched_at=_FIXED_NOW,
     )
     s = MarketValue(
         metric="shares_outstanding",
@@ -404,7 +383,7 @@ async def _make_snapshot_async(symbol):
         vendor="finnhub",
         symbol=symbol,
         endpoint="profile",
-        fetched_at=now,
+        fetched_at=_FIXED_NOW,
     )
     mcap = ComputedValue(
         metric="market_cap",
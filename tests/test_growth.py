@@ -1,13 +1,18 @@
 """Tests for year-over-year growth computation (LTM vs LTM-1)."""
 
-from types import SimpleNamespace
+from collections import namedtuple
+
+import pytest
 
 from handspread.analysis.growth import compute_growth
 
+# Stub CitedValue: growth only reads .value and .warnings
+_Cited = namedtuple("_Cited", ["value", "warnings"], defaults=((),))
+
 
 def _cited(value):
     """Stub CitedValue with .value attribute for growth tests."""
-    return SimpleNamespace(value=value)
+    return _Cited(value)
 
 
 class TestBasicGrowth:
@@ -17,14 +22,14 @@ class TestBasicGrowth:
         result = compute_growth(ltm, ltm1)
 
         assert "revenue_yoy" in result
-        assert abs(result["revenue_yoy"].value - 0.2) < 0.001
+        assert result["revenue_yoy"].value == pytest.approx(0.2, abs=1e-3)
 
     def test_negative_growth(self):
         ltm = {"revenue": _cited(80)}
         ltm1 = {"revenue": _cited(100)}
         result = compute_growth(ltm, ltm1)
 
-        assert abs(result["revenue_yoy"].value - (-0.2)) < 0.001
+        assert result["revenue_yoy"].value == pytest.approx(-0.2, abs=1e-3)
 
     def test_multiple_metrics(self):
         ltm = {
@@ -45,8 +50,8 @@ class TestBasicGrowth:
         assert "net_income_yoy" in result
         assert "ebitda_yoy" in result
         assert "eps_diluted_yoy" in result
-        assert abs(result["revenue_yoy"].value - 0.1) < 0.001
-        assert abs(result["eps_diluted_yoy"].value - 0.1) < 0.001
+        assert result["revenue_yoy"].value == pytest.approx(0.1, abs=1e-3)
+        assert result["eps_diluted_yoy"].value == pytest.approx(0.1, abs=1e-3)
 
     def test_zero_growth(self):
         ltm = {"revenue": _cited(100)}
@@ -93,7 +98,7 @@ class TestEdgeCases:
         result = compute_growth(ltm, ltm1)
 
         # (10 - (-20)) / abs(-20) = 30/20 = 1.5
-        assert abs(result["net_income_yoy"].value - 1.5) < 0.001
+        assert result["net_income_yoy"].value == pytest.approx(1.5, abs=1e-3)
         assert any("negative" in w for w in result["net_income_yoy"].warnings)
 
     def test_zero_prior_returns_none(self):
@@ -110,7 +115,7 @@ class TestEdgeCases:
         ltm1 = {"net_income": _cited(-20)}
         result = compute_growth(ltm, ltm1)
 
-        assert abs(result["net_income_yoy"].value - 0.5) < 0.001
+        assert result["net_income_yoy"].value == pytest.approx(0.5, abs=1e-3)
         assert any("negative" in w for w in result["net_income_yoy"].warnings)
 
 
@@ -132,9 +137,9 @@ class TestSplitWarningSkipsGrowth:
 
     def test_split_warning_skips_growth(self):
         """LTM-1 value with split warning produces value=None growth."""
-        ltm_src = SimpleNamespace(value=2.5, warnings=[])
-        ltm1_src = SimpleNamespace(
-            value=25.0,
+        ltm_src = _Cited(2.5, warnings=[])
+        ltm1_src = _Cited(
+            25.0,
             warnings=[
                 "Possible stock split contamination: LTM-derived value differs from annual by 0.1x"
             ],
@@ -150,14 +155,14 @@ class TestSplitWarningSkipsGrowth:
 
     def test_normal_growth_no_warning(self):
         """Values without warnings compute growth normally."""
-        ltm_src = SimpleNamespace(value=2.5, warnings=[])
-        ltm1_src = SimpleNamespace(value=2.0, warnings=[])
+        ltm_src = _Cited(2.5, warnings=[])
+        ltm1_src = _Cited(2.0, warnings=[])
         ltm = {"eps_diluted": ltm_src}
         ltm1 = {"eps_diluted": ltm1_src}
         result = compute_growth(ltm, ltm1)
 
         assert "eps_diluted_yoy" in result
-        assert abs(result["eps_diluted_yoy"].value - 0.25) < 0.001
+        assert result["eps_diluted_yoy"].value == pytest.approx(0.25, abs=1e-3)
 
 
 class TestSplitDivergenceFlagsEps:
@@ -196,7 +201,7 @@ class TestSplitDivergenceFlagsEps:
         result = compute_growth(ltm, ltm1)
 
         assert result["eps_diluted_yoy"].value is not None
-        assert abs(result["eps_diluted_yoy"].value - 0.15) < 0.01
+        assert result["eps_diluted_yoy"].value == pytest.approx(0.15, abs=1e-2)
 
     def test_both_negative_no_flag(self):
         """Both declining: revenue -10%, EPS -25% -> no flag (not split-related)."""
@@ -236,7 +241,7 @@ class TestMarginDeltas:
         result = compute_growth(ltm, ltm1)
 
         assert "gross_margin_chg" in result
-        assert abs(result["gross_margin_chg"].value - 0.10) < 0.001
+        assert result["gross_margin_chg"].value == pytest.approx(0.10, abs=1e-3)
         assert result["gross_margin_chg"].unit == "pure"
 
     def test_ebitda_margin_compression(self):
@@ -246,7 +251,7 @@ class TestMarginDeltas:
         result = compute_growth(ltm, ltm1)
 
         assert "ebitda_margin_chg" in result
-        assert abs(result["ebitda_margin_chg"].value - (-0.05)) < 0.001
+        assert result["ebitda_margin_chg"].value == pytest.approx(-0.05, abs=1e-3)
 
     def test_adjusted_ebitda_margin_delta(self):
         """Adj EBITDA margin: LTM = (100+20+10)/200 = 65%, LTM-1 = (80+15+5)/200 = 50%."""
@@ -266,7 +271,7 @@ class TestMarginDeltas:
 
         assert "adjusted_ebitda_margin_chg" in result
         # 130/200 - 100/200 = 0.65 - 0.50 = 0.15
-        assert abs(result["adjusted_ebitda_margin_chg"].value - 0.15) < 0.001
+        assert result["adjusted_ebitda_margin_chg"].value == pytest.approx(0.15, abs=1e-3)
 
     def test_margin_unchanged_proportional_scaling(self):
         """Revenue and numerator both double: margin stays flat, delta = 0."""
@@ -275,7 +280,7 @@ class TestMarginDeltas:
         result = compute_growth(ltm, ltm1)
 
         assert "gross_margin_chg" in result
-        assert abs(result["gross_margin_chg"].value) < 0.001
+        assert result["gross_margin_chg"].value == pytest.approx(0, abs=1e-3)
 
     def test_missing_ltm_revenue_skips_margin_delta(self):
         ltm = {"gross_profit": _cited(60)}
@@ -315,7 +320,7 @@ class TestComputedGrossMarginDelta:
         result = compute_growth(ltm, ltm1)
 
         assert "gross_margin_chg" in result
-        assert abs(result["gross_margin_chg"].value - 0.10) < 0.001
+        assert result["gross_margin_chg"].value == pytest.approx(0.10, abs=1e-3)
 
         # Verify provenance traces to revenue + cost_of_revenue
         current = result["gross_margin_chg"].components["current"]
@@ -331,7 +336,7 @@ class TestComputedGrossMarginDelta:
         result = compute_growth(ltm, ltm1)
 
         assert "gross_margin_chg" in result
-        assert abs(result["gross_margin_chg"].value - 0.10) < 0.001
+        assert result["gross_margin_chg"].value == pytest.approx(0.10, abs=1e-3)
 
     def test_gross_margin_chg_mixed_availability(self):
         """LTM has COGS, LTM-1 only has reported gross_profit. Both periods resolve."""
@@ -346,4 +351,4 @@ class TestComputedGrossMarginDelta:
         result = compute_growth(ltm, ltm1)
 
         assert "gross_margin_chg" in result
-        assert abs(result["gross_margin_chg"].value - 0.10) < 0.001
+        assert result["gross_margin_chg"].value == pytest.approx(0.10, abs=1e-3)
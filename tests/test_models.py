@@ -4,6 +4,8 @@ from datetime import UTC, datetime
 
 from handspread.models import ComputedValue, MarketSnapshot, MarketValue
 
+_FIXED_NOW = datetime(2025, 1, 15, 12, 0, tzinfo=UTC)
+
 
 def _make_market_value(**overrides):
     defaults = {
@@ -13,7 +15,7 @@ def _make_market_value(**overrides):
         "vendor": "finnhub",
         "symbol": "TEST",
         "endpoint": "quote",
-        "fetched_at": datetime(2025, 1, 15, 12, 0, tzinfo=UTC),
+        "fetched_at": _FIXED_NOW,
     }
     defaults.update(overrides)
     return MarketValue(**defaults)
@@ -1,16 +1,29 @@
 """Tests for valuation multiples computation."""
 
-from datetime import UTC, datetime
-from types import SimpleNamespace
+from dataclasses import dataclass
 
-from handspread.analysis._utils import compute_adjusted_ebitda
+import pytest
+
+from handspread.analysis._utils import (
+    CURRENCY_MISMATCH,
+    NEGATIVE_DENOMINATOR,
+    compute_adjusted_ebitda,
+)
 from handspread.analysis.multiples import compute_multiples
-from handspread.models import ComputedValue, EVBridge, MarketSnapshot, MarketValue
+from handspread.models import ComputedValue, EVBridge
+
+
+@dataclass(frozen=True, slots=True)
+class _Cited:
+    """Stub CitedValue: multiples reads .value, plus .unit for currency checks."""
+
+    value: float | None
+    metric: str = "test"
+    unit: str | None = None
 
 
 def _cited(value, metric="test", unit=None):
-    """Stub CitedValue via SimpleNamespace (only .value is read by multiples)."""
-    return SimpleNamespace(value=value, metric=metric, unit=unit)
+    return _Cited(value, metric, unit)
 
 
 def _make_ev_bridge(ev_value):
@@ -24,64 +37,28 @@ def _make_ev_bridge(ev_value):
     )
 
 
-def _make_snapshot(price=100.0, shares=1_000_000):
-    now = datetime(2025, 1, 15, 12, 0, tzinfo=UTC)
-    p = MarketValue(
-        metric="price",
-        value=price,
-        unit="USD",
-        vendor="finnhub",
-        symbol="TEST",
-        endpoint="quote",
-        fetched_at=now,
-    )
-    s = MarketValue(
-        metric="shares_outstanding",
-        value=shares,
-        unit="shares",
-        vendor="finnhub",
-        symbol="TEST",
-        endpoint="profile",
-        fetched_at=now,
-    )
-    mcap_val = price * shares if price and shares else None
-    mcap = ComputedValue(
-        metric="market_cap",
-        value=mcap_val,
-        unit="USD",
-        formula="price * shares_outstanding",
-    )
-    return MarketSnapshot(
-        symbol="TEST",
-        company_name="Test Corp",
-        price=p,
-        shares_outstanding=s,
-        market_cap=mcap,
-    )
-
-
 class TestEVMultiples:
-    def test_ev_revenue(self):
+    def test_ev_revenue(self, default_snapshot):
         bridge = _make_ev_bridge(10_000_000_000)
-        market = _make_snapshot()
+        market = default_snapshot
         sec = {"revenue": _cited(2_000_000_000)}
 
         result = compute_multiples(bridge, market, sec)
-        assert abs(result["ev_revenue"].value - 5.0) < 0.001
+        assert result["ev_revenue"].value == pytest.approx(5.0, abs=1e-3)
 
-    def test_ev_ebitda_gaap(self):
+    def test_ev_ebitda_gaap(self, default_snapshot):
         """GAAP EV/EBITDA uses the raw ebitda value."""
         bridge = _make_ev_bridge(10_000_000_000)
-        market = _make_snapshot()
+        market = default_snapshot
         sec = {"ebitda": _cited(1_000_000_000)}
 
         result = compute_multiples(bridge, market, sec)
-        assert abs(result["ev_ebitda_gaap"].value - 10.0) < 0.001
+        assert result["ev_ebitda_gaap"].value == pytest.approx(10.0, abs=1e-3)
 
-    def test_ev_ebitda_adjusted(self):
+    def test_ev_ebitda_adjusted(self, default_snapshot):
         """EV/EBITDA (adjusted) = EV / (OI + D&A + SBC)."""
         bridge = _make_ev_bridge(10_000_000_000)
-        market = _make_snapshot()
+        market = default_snapshot
         sec = {
             "operating_income": _cited(600_000_000),
             "depreciation_amortization": _cited(200_000_000),
@@ -90,12 +67,12 @@ class TestEVMultiples:
 
         result = compute_multiples(bridge, market, sec)
         # adjusted EBITDA = 600M + 200M + 200M = 1B
-        assert abs(result["ev_ebitda"].value - 10.0) < 0.001
+        assert result["ev_ebitda"].value == pytest.approx(10.0, abs=1e-3)
 
-    def test_ev_ebitda_adjusted_no_sbc_falls_back_to_gaap(self):
+    def test_ev_ebitda_adjusted_no_sbc_falls_back_to_gaap(self, default_snapshot):
         """Missing SBC means adjusted EBITDA = OI + D&A (equals GAAP EBITDA)."""
         bridge = _make_ev_bridge(10_000_000_000)
-        market = _make_snapshot()
+        market = default_snapshot
         sec = {
             "operating_income": _cited(800_000_000),
             "depreciation_amortization": _cited(200_000_000),
@@ -103,20 +80,20 @@ class TestEVMultiples:
 
         result = compute_multiples(bridge, market, sec)
         # adjusted EBITDA = 800M + 200M + 0 = 1B
-        assert abs(result["ev_ebitda"].value - 10.0) < 0.001
+        assert result["ev_ebitda"].value == pytest.approx(10.0, abs=1e-3)
 
-    def test_none_denominator(self):
+    def test_none_denominator(self, default_snapshot):
         bridge = _make_ev_bridge(10_000_000_000)
-        market = _make_snapshot()
+        market = default_snapshot
         sec = {}
 
         result = compute_multiples(bridge, market, sec)
         assert result["ev_revenue"].value is None
         assert any("Denominator unavailable" in w for w in result["ev_revenue"].warnings)
 
-    def test_zero_denominator(self):
+    def test_zero_denominator(self, default_snapshot):
         bridge = _make_ev_bridge(10_000_000_000)
-        market = _make_snapshot()
+        market = default_snapshot
         sec = {"revenue": _cited(0)}
 
         result = compute_multiples(bridge, market, sec)
@@ -177,10 +154,10 @@ class TestAdjustedEBITDA:
         assert "depreciation_amortization" in cv.components
         assert "stock_based_compensation" in cv.components
 
-    def test_adjusted_ebitda_in_result_dict(self):
+    def test_adjusted_ebitda_in_result_dict(self, default_snapshot):
         """compute_multiples should emit adjusted_ebitda as a standalone entry."""
         bridge = _make_ev_bridge(10_000_000_000)
-        market = _make_snapshot()
+        market = default_snapshot
         sec = {
             "operating_income": _cited(600_000_000),
             "depreciation_amortization": _cited(200_000_000),
@@ -191,65 +168,65 @@ class TestAdjustedEBITDA:
         assert result["adjusted_ebitda"].value == 1_000_000_000
         assert result["adjusted_ebitda"].metric == "adjusted_ebitda"
 
-    def test_adjusted_ebitda_absent_when_missing_components(self):
+    def test_adjusted_ebitda_absent_when_missing_components(self, default_snapshot):
         """If OI or D&A is missing, adjusted_ebitda should not appear in result."""
         bridge = _make_ev_bridge(10_000_000_000)
-        market = _make_snapshot()
+        market = default_snapshot
         sec = {"revenue": _cited(2_000_000_000)}
         result = compute_multiples(bridge, market, sec)
         assert "adjusted_ebitda" not in result
 
 
 class TestEquityMultiples:
-    def test_pe_ratio(self):
+    def test_pe_ratio(self, default_snapshot):
         bridge = _make_ev_bridge(10_000_000_000)
-        market = _make_snapshot(price=100.0, shares=1_000_000)
+        market = default_snapshot
         sec = {"net_income": _cited(5_000_000)}
 
         result = compute_multiples(bridge, market, sec)
-        expected = 100_000_000 / 5_000_000  # 20x
-        assert abs(result["pe"].value - expected) < 0.001
+        # mcap 100M / NI 5M = 20x
+        assert result["pe"].value == pytest.approx(20.0, abs=1e-3)
 
-    def test_fcf_yield(self):
+    def test_fcf_yield(self, default_snapshot):
         bridge = _make_ev_bridge(10_000_000_000)
-        market = _make_snapshot(price=100.0, shares=1_000_000)
+        market = default_snapshot
         sec = {"free_cash_flow": _cited(10_000_000)}
 
         result = compute_multiples(bridge, market, sec)
-        expected = 10_000_000 / 100_000_000  # 0.1
-        assert abs(result["fcf_yield"].value - expected) < 0.001
+        # FCF 10M / mcap 100M = 0.1
+        assert result["fcf_yield"].value == pytest.approx(0.1, abs=1e-3)
         assert result["fcf_yield"].unit == "pure"
 
-    def test_dividend_yield(self):
+    def test_dividend_yield(self, snapshot_factory):
         bridge = _make_ev_bridge(10_000_000_000)
-        market = _make_snapshot(price=50.0, shares=1_000_000)
+        market = snapshot_factory(price=50.0)
         sec = {"dividends_per_share": _cited(2.0)}
 
         result = compute_multiples(bridge, market, sec)
-        expected = 2.0 / 50.0  # 0.04
-        assert abs(result["dividend_yield"].value - expected) < 0.001
+        # DPS 2.0 / price 50.0 = 0.04
+        assert result["dividend_yield"].value == pytest.approx(0.04, abs=1e-3)
         assert result["dividend_yield"].unit == "pure"
 
 
 class TestNegativeNetIncomePE:
-    def test_negative_net_income_pe(self):
+    def test_negative_net_income_pe(self, default_snapshot):
         """Negative NI produces a negative P/E with warning about negative denominator."""
         bridge = _make_ev_bridge(10_000_000_000)
-        market = _make_snapshot(price=100.0, shares=1_000_000)
+        market = default_snapshot
         sec = {"net_income": _cited(-5_000_000)}
 
         result = compute_multiples(bridge, market, sec)
         # mcap = 100M, NI = -5M, P/E = -20x
         assert result["pe"].value is not None
         assert result["pe"].value < 0
-        assert any("Negative denominator" in w for w in result["pe"].warnings)
+        assert any(NEGATIVE_DENOMINATOR in w for w in result["pe"].warnings)
 
 
 class TestNoneEVProducesNoneMultiples:
-    def test_none_ev_produces_none_multiples(self):
+    def test_none_ev_produces_none_multiples(self, default_snapshot):
         """EVBridge with None EV produces None for all EV-based multiples."""
         bridge = _make_ev_bridge(None)
-        market = _make_snapshot(price=100.0, shares=1_000_000)
+        market = default_snapshot
         sec = {"revenue": _cited(1_000_000)}
 
         result = compute_multiples(bridge, market, sec)
@@ -259,61 +236,64 @@ class TestNoneEVProducesNoneMultiples:
 
 
 class TestComputedFCFMultiples:
-    def test_ev_fcf_uses_computed_fcf(self):
+    def test_ev_fcf_uses_computed_fcf(self, default_snapshot):
         """EV/FCF uses computed FCF (OCF - capex) as denominator."""
         bridge = _make_ev_bridge(10_000_000_000)
-        market = _make_snapshot()
+        market = default_snapshot
         sec = {
             "operating_cash_flow": _cited(2_000_000_000),
             "capex": _cited(500_000_000),
         }
         result = compute_multiples(bridge, market, sec)
         # FCF = 2B - 0.5B = 1.5B, EV/FCF = 10B / 1.5B = 6.67x
-        assert abs(result["ev_fcf"].value - (10_000_000_000 / 1_500_000_000)) < 0.01
+        assert result["ev_fcf"].value == pytest.approx(10_000_000_000 / 1_500_000_000, abs=1e-2)
         # Denominator should trace to computed FCF
         den = result["ev_fcf"].components["denominator"]
         assert den.formula == "operating_cash_flow - capex"
 
-    def test_fcf_yield_uses_computed_fcf(self):
+    def test_fcf_yield_uses_computed_fcf(self, default_snapshot):
         """FCF yield uses computed FCF (OCF - capex) as numerator."""
         bridge = _make_ev_bridge(10_000_000_000)
-        market = _make_snapshot(price=100.0, shares=1_000_000)  # mcap = 100M
+        market = default_snapshot  # mcap = 100M
         sec = {
             "operating_cash_flow": _cited(20_000_000),
             "capex": _cited(10_000_000),
         }
         result = compute_multiples(bridge, market, sec)
         # FCF = 20M - 10M = 10M, yield = 10M / 100M = 0.1
-        assert abs(result["fcf_yield"].value - 0.1) < 0.001
+        assert result["fcf_yield"].value == pytest.approx(0.1, abs=1e-3)
         num = result["fcf_yield"].components["numerator"]
         assert num.formula == "operating_cash_flow - capex"
 
-    def test_ev_fcf_falls_back_to_derived(self):
+    def test_ev_fcf_falls_back_to_derived(self, default_snapshot):
         """Missing OCF/capex falls back to edgarpack's derived FCF."""
         bridge = _make_ev_bridge(10_000_000_000)
-        market = _make_snapshot()
+        market = default_snapshot
         sec = {"free_cash_flow": _cited(2_000_000_000)}
         result = compute_multiples(bridge, market, sec)
-        assert abs(result["ev_fcf"].value - 5.0) < 0.001
+        assert result["ev_fcf"].value == pytest.approx(5.0, abs=1e-3)
 
 
-class TestCurrencyMismatch:
-    def test_non_usd_sec_data_blocks_market_cross_metrics(self):
-        bridge = _make_ev_bridge(10_000_000_000)
-        market = _make_snapshot(price=100.0, shares=1_000_000)
-        sec = {
-            "revenue": _cited(2_000_000_000, unit="JPY"),
-            "ebitda": _cited(1_000_000_000, unit="JPY"),
-            "operating_income": _cited(800_000_000, unit="JPY"),
-            "free_cash_flow": _cited(700_000_000, unit="JPY"),
-            "net_income": _cited(600_000_000, unit="JPY"),
-            "stockholders_equity": _cited(4_000_000_000, unit="JPY"),
-            "dividends_per_share": _cited(100, unit="JPY/shares"),
-        }
+@pytest.fixture(scope="module")
+def jpy_multiples(default_snapshot):
+    """compute_multiples over JPY-denominated SEC data, shared by the mismatch checks."""
+    bridge = _make_ev_bridge(10_000_000_000)
+    sec = {
+        "revenue": _cited(2_000_000_000, unit="JPY"),
+        "ebitda": _cited(1_000_000_000, unit="JPY"),
+        "operating_income": _cited(800_000_000, unit="JPY"),
+        "free_cash_flow": _cited(700_000_000, unit="JPY"),
+        "net_income": _cited(600_000_000, unit="JPY"),
+        "stockholders_equity": _cited(4_000_000_000, unit="JPY"),
+        "dividends_per_share": _cited(100, unit="JPY/shares"),
+    }
+    return compute_multiples(bridge, default_snapshot, sec)
 
-        result = compute_multiples(bridge, market, sec)
 
-        for metric in (
+class TestCurrencyMismatch:
+    @pytest.mark.parametrize(
+        "metric",
+        [
             "ev_revenue",
             "ev_ebitda",
             "ev_ebit",
@@ -322,6 +302,8 @@ class TestCurrencyMismatch:
             "price_book",
             "fcf_yield",
             "dividend_yield",
-        ):
-            assert result[metric].value is None
-            assert any("cannot mix currencies" in w for w in result[metric].warnings)
+        ],
+    )
+    def test_non_usd_sec_data_blocks_market_cross_metrics(self, jpy_multiples, metric):
+        assert jpy_multiples[metric].value is None
+        assert any(CURRENCY_MISMATCH in w for w in jpy_multiples[metric].warnings)
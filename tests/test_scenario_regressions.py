@@ -2,48 +2,75 @@
 
 from __future__ import annotations
 
+import functools
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from types import SimpleNamespace
-from unittest.mock import AsyncMock, patch
+from types import MappingProxyType
+from typing import Any
 
 import pytest
 from edgarpack.query.models import QueryResult
 
+from handspread import engine as _engine
+from handspread.analysis._utils import CURRENCY_MISMATCH, NEGATIVE_DENOMINATOR
 from handspread.engine import analyze_comps
-from handspread.models import ComputedValue, EVPolicy, MarketSnapshot, MarketValue
+from handspread.models import (
+    CompanyAnalysis,
+    ComputedValue,
+    EVPolicy,
+    MarketSnapshot,
+    MarketValue,
+)
+
+# Share one event loop across the module; analyze_comps keeps no loop-bound state
+# once the SEC and market streams are stubbed.
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+_FIXED_NOW = datetime(2026, 2, 17, 12, 0, tzinfo=UTC)
+
+
+@dataclass(frozen=True, slots=True)
+class _Cited:
+    """Stub CitedValue: the engine reads .value, .metric and .unit."""
+
+    value: float | None
+    metric: str
+    unit: str | None = "USD"
 
 
 def _cited(value, metric: str, unit: str | None = "USD"):
-    return SimpleNamespace(value=value, metric=metric, unit=unit)
+    return _Cited(value, metric, unit)
 
 
+# The engine only reads snapshots, so one instance per (symbol, price, shares) is reused
+@functools.lru_cache(maxsize=256)
 def _snapshot(symbol: str, price: float, shares: float) -> MarketSnapshot:
-    now = datetime(2026, 2, 17, 12, 0, tzinfo=UTC)
-    price_mv = MarketValue(
+    price_mv = MarketValue.model_construct(
         metric="price",
         value=price,
         unit="USD",
         vendor="finnhub",
         symbol=symbol,
         endpoint="quote",
-        fetched_at=now,
+        fetched_at=_FIXED_NOW,
     )
-    shares_mv = MarketValue(
+    shares_mv = MarketValue.model_construct(
         metric="shares_outstanding",
         value=shares,
         unit="shares",
         vendor="finnhub",
         symbol=symbol,
         endpoint="profile",
-        fetched_at=now,
+        fetched_at=_FIXED_NOW,
     )
-    market_cap = ComputedValue(
+    market_cap = ComputedValue.model_construct(
         metric="market_cap",
         value=price * shares,
         unit="USD",
         formula="price * shares_outstanding",
     )
-    return MarketSnapshot(
+    return MarketSnapshot.model_construct(
         symbol=symbol,
         company_name=f"{symbol} Corp",
         price=price_mv,
@@ -52,17 +79,27 @@ def _snapshot(symbol: str, price: float, shares: float) -> MarketSnapshot:
     )
 
 
-def _query_result(symbol: str, metrics: dict, period: str = "ltm") -> QueryResult:
+def _snapshots_for(tickers, price: float, shares: float) -> dict[str, MarketSnapshot]:
+    """Market map for a cohort whose tickers share price and shares."""
+    return {t: _snapshot(t, price, shares) for t in tickers}
+
+
+@functools.lru_cache(maxsize=64)
+def _fake_cik(symbol: str) -> str:
+    return f"{abs(hash(symbol)) % (10**10):010d}"
+
+
+def _query_result(symbol: str, metrics: Mapping[str, Any], period: str = "ltm") -> QueryResult:
     return QueryResult.model_construct(
         company=f"{symbol} Corp",
-        cik=f"{abs(hash(symbol)) % (10**10):010d}",
+        cik=_fake_cik(symbol),
         period=period,
         metrics=metrics,
     )
 
 
-def _ltm_metrics(unit: str = "USD", **overrides):
-    base = {
+def _build_ltm_base(unit: str) -> dict:
+    return {
         "revenue": _cited(20_000_000_000, "revenue", unit),
         "cost_of_revenue": _cited(6_000_000_000, "cost_of_revenue", unit),
         "gross_profit": _cited(14_000_000_000, "gross_profit", unit),
@@ -84,16 +121,9 @@ def _ltm_metrics(unit: str = "USD", **overrides):
         "capex": _cited(1_500_000_000, "capex", unit),
         "dividends_per_share": _cited(2.0, "dividends_per_share", f"{unit}/shares"),
     }
-    for key, value in overrides.items():
-        if value is None:
-            base.pop(key, None)
-        else:
-            base[key] = value
-    return base
 
 
-def _growth_metrics(unit: str = "USD"):
-    """LTM-1 values: single CitedValue per metric (prior year trailing twelve months)."""
+def _build_growth_base(unit: str) -> dict:
     return {
         "revenue": _cited(18_000_000_000, "revenue", unit),
         "cost_of_revenue": _cited(6_000_000_000, "cost_of_revenue", unit),
@@ -107,42 +137,92 @@ def _growth_metrics(unit: str = "USD"):
     }
 
 
-async def _run_analysis(
-    tickers: list[str],
-    ltm_data: dict[str, QueryResult],
-    growth_data: dict[str, QueryResult],
-    market_data: dict[str, MarketSnapshot],
-    ev_policy: EVPolicy | None = None,
-):
-    async def _mock_comps(requested_tickers, _requested_metrics, period):
-        assert requested_tickers == tickers
-        return growth_data if period == "ltm-1" else ltm_data
-
-    with (
-        patch("handspread.engine.comps", new=AsyncMock(side_effect=_mock_comps)),
-        patch("handspread.engine.fetch_market_snapshots", new=AsyncMock(return_value=market_data)),
+# Base metric dicts per unit, built once. The engine only reads the cited values,
+# so they are shared. LTM callers get a fresh top-level dict; LTM-1 metrics are never
+# mutated, so without overrides every ticker shares one read-only view.
+_LTM_BASE_BY_UNIT: dict[str, dict] = {}
+_GROWTH_BASE_BY_UNIT: dict[str, MappingProxyType] = {}
+
+
+def _with_overrides(base: Mapping, overrides: dict) -> dict:
+    """Copy base, replacing overridden metrics and dropping those overridden with None."""
+    metrics = base.copy()
+    for key, value in overrides.items():
+        if value is None:
+            metrics.pop(key, None)
+        else:
+            metrics[key] = value
+    return metrics
+
+
+def _ltm_metrics(unit: str = "USD", **overrides):
+    if unit not in _LTM_BASE_BY_UNIT:
+        _LTM_BASE_BY_UNIT[unit] = _build_ltm_base(unit)
+    return _with_overrides(_LTM_BASE_BY_UNIT[unit], overrides)
+
+
+def _growth_metrics(unit: str = "USD", **overrides) -> Mapping[str, Any]:
+    """LTM-1 values: single CitedValue per metric (prior year trailing twelve months)."""
+    if unit not in _GROWTH_BASE_BY_UNIT:
+        _GROWTH_BASE_BY_UNIT[unit] = MappingProxyType(_build_growth_base(unit))
+    if not overrides:
+        return _GROWTH_BASE_BY_UNIT[unit]
+    return _with_overrides(_GROWTH_BASE_BY_UNIT[unit], overrides)
+
+
+@pytest.fixture
+def run_analysis(monkeypatch):
+    """Run analyze_comps with SEC and market streams stubbed by plain coroutines."""
+
+    async def run(
+        tickers: list[str],
+        ltm_data: dict[str, QueryResult],
+        growth_data: dict[str, QueryResult],
+        market_data: dict[str, MarketSnapshot],
+        ev_policy: EVPolicy | None = None,
     ):
+        async def _stub_comps(requested_tickers, _requested_metrics, period):
+            assert list(requested_tickers) == tickers
+            return growth_data if period == "ltm-1" else ltm_data
+
+        async def _stub_market(_requested_tickers):
+            return market_data
+
+        monkeypatch.setattr(_engine, "comps", _stub_comps)
+        monkeypatch.setattr(_engine, "fetch_market_snapshots", _stub_market)
         return await analyze_comps(tickers, ev_policy=ev_policy)
 
+    return run
+
 
-@pytest.mark.asyncio
-async def test_big_tech_baseline_golden_path():
-    tickers = ["AAPL", "MSFT", "GOOG", "AMZN", "META", "NVDA"]
-    ltm = {}
-    growth = {}
-    market = {}
+def _no_overrides(_ticker: str) -> dict:
+    return {}
 
-    for ticker in tickers:
-        overrides = {}
-        if ticker == "AAPL":
-            overrides["stockholders_equity"] = _cited(-2_000_000_000, "stockholders_equity", "USD")
-        ltm[ticker] = _query_result(ticker, _ltm_metrics(**overrides))
-        growth[ticker] = _query_result(ticker, _growth_metrics(), period="ltm-1")
-        market[ticker] = _snapshot(ticker, price=100.0, shares=1_000_000_000)
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+@dataclass(frozen=True)
+class _Cohort:
+    """A multi-ticker cohort: uniform market data, per-ticker LTM overrides, shared checks."""
 
-    assert len(results) == len(tickers)
+    name: str
+    tickers: tuple[str, ...]
+    price: float
+    shares: float
+    check: Callable[[list[CompanyAnalysis]], None]
+    ltm_overrides: Callable[[str], dict] = _no_overrides
+    units: dict[str, str] = field(default_factory=dict)  # ticker -> filing currency, else USD
+    ev_policy: EVPolicy | None = None
+
+
+# Override dicts are built once and shared; _ltm_metrics copies them, never mutates
+_AAPL_OVERRIDES = {"stockholders_equity": _cited(-2_000_000_000, "stockholders_equity", "USD")}
+
+
+def _big_tech_overrides(ticker: str) -> dict:
+    return _AAPL_OVERRIDES if ticker == "AAPL" else {}
+
+
+def _check_big_tech(results: list[CompanyAnalysis]) -> None:
+    assert len(results) == 6
     for result in results:
         assert result.ev_bridge is not None
         assert result.ev_bridge.enterprise_value is not None
@@ -161,34 +241,25 @@ async def test_big_tech_baseline_golden_path():
     aapl = next(r for r in results if r.symbol == "AAPL")
     assert aapl.multiples["price_book"].value is not None
     assert aapl.multiples["price_book"].value < 0
-    assert any("Negative denominator" in w for w in aapl.multiples["price_book"].warnings)
+    assert any(NEGATIVE_DENOMINATOR in w for w in aapl.multiples["price_book"].warnings)
 
 
-@pytest.mark.asyncio
-async def test_financials_show_expected_metric_gaps():
-    tickers = ["JPM", "GS", "BAC", "WFC", "MS"]
-    ltm = {}
-    growth = {}
-    market = {}
+_FINANCIALS_OVERRIDES = {
+    "ebitda": None,
+    "operating_income": None,
+    "free_cash_flow": None,
+    "rd_expense": None,
+    "sga_expense": None,
+    "capex": None,
+    "dividends_per_share": None,
+}
 
-    for ticker in tickers:
-        ltm[ticker] = _query_result(
-            ticker,
-            _ltm_metrics(
-                ebitda=None,
-                operating_income=None,
-                free_cash_flow=None,
-                rd_expense=None,
-                sga_expense=None,
-                capex=None,
-                dividends_per_share=None,
-            ),
-        )
-        growth[ticker] = _query_result(ticker, _growth_metrics(), period="ltm-1")
-        market[ticker] = _snapshot(ticker, price=80.0, shares=2_000_000_000)
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+def _financials_overrides(_ticker: str) -> dict:
+    return _FINANCIALS_OVERRIDES
 
+
+def _check_financials(results: list[CompanyAnalysis]) -> None:
     for result in results:
         assert result.multiples["ev_revenue"].value is not None
         assert result.multiples["pe"].value is not None
@@ -199,63 +270,39 @@ async def test_financials_show_expected_metric_gaps():
         assert "adjusted_ebitda_margin" not in result.operating
 
 
-@pytest.mark.asyncio
-async def test_negative_equity_buyback_names():
-    tickers = ["SBUX", "MCD", "BA", "HLT"]
-    ltm = {}
-    growth = {}
-    market = {}
+_NEGATIVE_EQUITY_OVERRIDES = {
+    "stockholders_equity": _cited(-2_000_000_000, "stockholders_equity", "USD"),
+    "total_debt": _cited(5_000_000_000, "total_debt", "USD"),
+}
+_HLT_OVERRIDES = {
+    "stockholders_equity": _cited(-1_000_000_000, "stockholders_equity", "USD"),
+    "total_debt": _cited(500_000_000, "total_debt", "USD"),
+}
 
-    for ticker in tickers:
-        overrides = {
-            "stockholders_equity": _cited(-2_000_000_000, "stockholders_equity", "USD"),
-            "total_debt": _cited(5_000_000_000, "total_debt", "USD"),
-        }
-        if ticker == "HLT":
-            overrides["total_debt"] = _cited(500_000_000, "total_debt", "USD")
-            overrides["stockholders_equity"] = _cited(-1_000_000_000, "stockholders_equity", "USD")
 
-        ltm[ticker] = _query_result(ticker, _ltm_metrics(**overrides))
-        growth[ticker] = _query_result(ticker, _growth_metrics(), period="ltm-1")
-        market[ticker] = _snapshot(ticker, price=120.0, shares=300_000_000)
+def _negative_equity_overrides(ticker: str) -> dict:
+    return _HLT_OVERRIDES if ticker == "HLT" else _NEGATIVE_EQUITY_OVERRIDES
 
-    results = await _run_analysis(tickers, ltm, growth, market)
 
+def _check_negative_equity(results: list[CompanyAnalysis]) -> None:
     for result in results:
         assert result.errors == []
-        assert any("Negative denominator" in w for w in result.multiples["price_book"].warnings)
+        assert any(NEGATIVE_DENOMINATOR in w for w in result.multiples["price_book"].warnings)
 
     hlt = next(r for r in results if r.symbol == "HLT")
     assert "roic" not in hlt.operating
 
 
-@pytest.mark.asyncio
-async def test_reits_exercise_lease_inclusion_path():
-    tickers = ["AMT", "PLD", "SPG", "O", "EQIX"]
-    ltm = {}
-    growth = {}
-    market = {}
+_REIT_OVERRIDES = {
+    "operating_lease_liabilities": _cited(12_000_000_000, "operating_lease_liabilities", "USD"),
+}
 
-    for ticker in tickers:
-        ltm[ticker] = _query_result(
-            ticker,
-            _ltm_metrics(
-                operating_lease_liabilities=_cited(
-                    12_000_000_000, "operating_lease_liabilities", "USD"
-                ),
-            ),
-        )
-        growth[ticker] = _query_result(ticker, _growth_metrics(), period="ltm-1")
-        market[ticker] = _snapshot(ticker, price=90.0, shares=500_000_000)
 
-    results = await _run_analysis(
-        tickers,
-        ltm,
-        growth,
-        market,
-        ev_policy=EVPolicy(include_leases=True),
-    )
+def _reit_overrides(_ticker: str) -> dict:
+    return _REIT_OVERRIDES
 
+
+def _check_reits(results: list[CompanyAnalysis]) -> None:
     for result in results:
         assert result.ev_bridge is not None
         assert result.ev_bridge.operating_lease_liabilities is not None
@@ -263,124 +310,67 @@ async def test_reits_exercise_lease_inclusion_path():
         assert result.multiples["ev_ebitda"].value is not None
 
 
-@pytest.mark.asyncio
-async def test_pre_revenue_and_deep_loss_names():
-    tickers = ["RIVN", "LCID", "IONQ", "DNA"]
-    ltm = {}
-    growth = {}
-    market = {}
+_PRE_REVENUE_OVERRIDES = {
+    "revenue": _cited(25_000_000, "revenue", "USD"),
+    "net_income": _cited(-3_000_000_000, "net_income", "USD"),
+    "free_cash_flow": _cited(-2_000_000_000, "free_cash_flow", "USD"),
+    "stockholders_equity": _cited(8_000_000_000, "stockholders_equity", "USD"),
+}
 
-    for ticker in tickers:
-        ltm[ticker] = _query_result(
-            ticker,
-            _ltm_metrics(
-                revenue=_cited(25_000_000, "revenue", "USD"),
-                net_income=_cited(-3_000_000_000, "net_income", "USD"),
-                free_cash_flow=_cited(-2_000_000_000, "free_cash_flow", "USD"),
-                stockholders_equity=_cited(8_000_000_000, "stockholders_equity", "USD"),
-            ),
-        )
-        growth[ticker] = _query_result(ticker, _growth_metrics(), period="ltm-1")
-        market[ticker] = _snapshot(ticker, price=60.0, shares=1_000_000_000)
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+def _pre_revenue_overrides(_ticker: str) -> dict:
+    return _PRE_REVENUE_OVERRIDES
 
+
+def _check_pre_revenue(results: list[CompanyAnalysis]) -> None:
     for result in results:
         assert result.errors == []
         assert result.multiples["ev_revenue"].value is not None
         assert result.multiples["ev_revenue"].value > 100
         assert result.multiples["pe"].value is not None
         assert result.multiples["pe"].value < 0
-        assert any("Negative denominator" in w for w in result.multiples["pe"].warnings)
-
-
-@pytest.mark.asyncio
-async def test_conglomerates_with_equity_method_adjustment():
-    tickers = ["BRK.B", "MMM", "JNJ", "RTX"]
-    ltm = {}
-    growth = {}
-    market = {}
-
-    for ticker in tickers:
-        overrides = {}
-        if ticker == "BRK.B":
-            overrides = {
-                "total_debt": _cited(100_000_000_000, "total_debt", "USD"),
-                "cash": _cited(30_000_000_000, "cash", "USD"),
-                "marketable_securities": _cited(200_000_000_000, "marketable_securities", "USD"),
-                "equity_method_investments": _cited(
-                    50_000_000_000, "equity_method_investments", "USD"
-                ),
-            }
+        assert any(NEGATIVE_DENOMINATOR in w for w in result.multiples["pe"].warnings)
 
-        ltm[ticker] = _query_result(ticker, _ltm_metrics(**overrides))
-        growth[ticker] = _query_result(ticker, _growth_metrics(), period="ltm-1")
-        market[ticker] = _snapshot(ticker, price=500.0, shares=2_000_000_000)
 
-    results = await _run_analysis(
-        tickers,
-        ltm,
-        growth,
-        market,
-        ev_policy=EVPolicy(subtract_equity_method_investments=True),
-    )
+_BRKB_OVERRIDES = {
+    "total_debt": _cited(100_000_000_000, "total_debt", "USD"),
+    "cash": _cited(30_000_000_000, "cash", "USD"),
+    "marketable_securities": _cited(200_000_000_000, "marketable_securities", "USD"),
+    "equity_method_investments": _cited(50_000_000_000, "equity_method_investments", "USD"),
+}
 
-    brkb = next(r for r in results if r.symbol == "BRK.B")
-    assert brkb.ev_bridge is not None
-    assert brkb.ev_bridge.equity_method_investments is not None
-    assert brkb.ev_bridge.marketable_securities is not None
 
-    expected_ev = (
-        500.0 * 2_000_000_000 + 100_000_000_000 - 30_000_000_000 - 200_000_000_000 - 50_000_000_000
-    )
-    assert brkb.ev_bridge.enterprise_value.value == expected_ev
+def _conglomerate_overrides(ticker: str) -> dict:
+    return _BRKB_OVERRIDES if ticker == "BRK.B" else {}
 
 
-@pytest.mark.asyncio
-async def test_foreign_adr_currency_mismatch_behavior():
-    tickers = ["TSM", "ASML", "SAP", "TM", "NVO", "SONY"]
-    unit_map = {"TSM": "TWD", "ASML": "EUR", "SAP": "EUR", "TM": "JPY", "NVO": "DKK", "SONY": "JPY"}
-    ltm = {}
-    growth = {}
-    market = {}
+# market cap + debt - cash - marketable securities - equity method investments
+_BRKB_EXPECTED_EV = (
+    500.0 * 2_000_000_000 + 100_000_000_000 - 30_000_000_000 - 200_000_000_000 - 50_000_000_000
+)
 
-    for ticker in tickers:
-        currency = unit_map[ticker]
-        ltm[ticker] = _query_result(ticker, _ltm_metrics(unit=currency))
-        growth[ticker] = _query_result(ticker, _growth_metrics(unit=currency), period="ltm-1")
-        market[ticker] = _snapshot(ticker, price=100.0, shares=1_000_000_000)
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+def _check_conglomerates(results: list[CompanyAnalysis]) -> None:
+    brkb = next(r for r in results if r.symbol == "BRK.B")
+    assert brkb.ev_bridge is not None
+    assert brkb.ev_bridge.equity_method_investments is not None
+    assert brkb.ev_bridge.marketable_securities is not None
+    assert brkb.ev_bridge.enterprise_value.value == _BRKB_EXPECTED_EV
 
+
+def _check_foreign_adr(results: list[CompanyAnalysis]) -> None:
     for result in results:
         assert result.ev_bridge is not None
         assert result.ev_bridge.enterprise_value.value is None
-        assert any("cannot mix currencies" in w for w in result.ev_bridge.enterprise_value.warnings)
+        assert any(CURRENCY_MISMATCH in w for w in result.ev_bridge.enterprise_value.warnings)
         assert result.multiples["pe"].value is None
-        assert any("cannot mix currencies" in w for w in result.multiples["pe"].warnings)
+        assert any(CURRENCY_MISMATCH in w for w in result.multiples["pe"].warnings)
         assert result.operating["rd_pct_revenue"].value is not None
         assert result.operating["revenue_per_share"].unit != "USD/shares"
-        assert any(
-            "cannot mix currencies" in w for w in result.operating["revenue_per_share"].warnings
-        )
-
+        assert any(CURRENCY_MISMATCH in w for w in result.operating["revenue_per_share"].warnings)
 
-@pytest.mark.asyncio
-async def test_chinese_adr_cluster_cny_behavior():
-    tickers = ["BABA", "PDD", "JD", "BIDU", "NIO"]
-    unit_map = {"BABA": "CNY", "PDD": "CNY", "JD": "CNY", "BIDU": "USD", "NIO": "CNY"}
-    ltm = {}
-    growth = {}
-    market = {}
-
-    for ticker in tickers:
-        currency = unit_map[ticker]
-        ltm[ticker] = _query_result(ticker, _ltm_metrics(unit=currency))
-        growth[ticker] = _query_result(ticker, _growth_metrics(unit=currency), period="ltm-1")
-        market[ticker] = _snapshot(ticker, price=70.0, shares=1_200_000_000)
-
-    results = await _run_analysis(tickers, ltm, growth, market)
 
+def _check_chinese_adr(results: list[CompanyAnalysis]) -> None:
     for result in results:
         if result.symbol == "BIDU":
             assert result.ev_bridge.enterprise_value.value is not None
@@ -388,65 +378,145 @@ async def test_chinese_adr_cluster_cny_behavior():
         else:
             assert result.ev_bridge.enterprise_value.value is None
             assert result.multiples["pe"].value is None
-            assert any("cannot mix currencies" in w for w in result.multiples["pe"].warnings)
+            assert any(CURRENCY_MISMATCH in w for w in result.multiples["pe"].warnings)
+
+
+_COHORTS = [
+    _Cohort(
+        name="big_tech_baseline_golden_path",
+        tickers=("AAPL", "MSFT", "GOOG", "AMZN", "META", "NVDA"),
+        price=100.0,
+        shares=1_000_000_000,
+        ltm_overrides=_big_tech_overrides,
+        check=_check_big_tech,
+    ),
+    _Cohort(
+        name="financials_show_expected_metric_gaps",
+        tickers=("JPM", "GS", "BAC", "WFC", "MS"),
+        price=80.0,
+        shares=2_000_000_000,
+        ltm_overrides=_financials_overrides,
+        check=_check_financials,
+    ),
+    _Cohort(
+        name="negative_equity_buyback_names",
+        tickers=("SBUX", "MCD", "BA", "HLT"),
+        price=120.0,
+        shares=300_000_000,
+        ltm_overrides=_negative_equity_overrides,
+        check=_check_negative_equity,
+    ),
+    _Cohort(
+        name="reits_exercise_lease_inclusion_path",
+        tickers=("AMT", "PLD", "SPG", "O", "EQIX"),
+        price=90.0,
+        shares=500_000_000,
+        ltm_overrides=_reit_overrides,
+        ev_policy=EVPolicy(include_leases=True),
+        check=_check_reits,
+    ),
+    _Cohort(
+        name="pre_revenue_and_deep_loss_names",
+        tickers=("RIVN", "LCID", "IONQ", "DNA"),
+        price=60.0,
+        shares=1_000_000_000,
+        ltm_overrides=_pre_revenue_overrides,
+        check=_check_pre_revenue,
+    ),
+    _Cohort(
+        name="conglomerates_with_equity_method_adjustment",
+        tickers=("BRK.B", "MMM", "JNJ", "RTX"),
+        price=500.0,
+        shares=2_000_000_000,
+        ltm_overrides=_conglomerate_overrides,
+        ev_policy=EVPolicy(subtract_equity_method_investments=True),
+        check=_check_conglomerates,
+    ),
+    _Cohort(
+        name="foreign_adr_currency_mismatch_behavior",
+        tickers=("TSM", "ASML", "SAP", "TM", "NVO", "SONY"),
+        price=100.0,
+        shares=1_000_000_000,
+        units={"TSM": "TWD", "ASML": "EUR", "SAP": "EUR", "TM": "JPY", "NVO": "DKK", "SONY": "JPY"},
+        check=_check_foreign_adr,
+    ),
+    _Cohort(
+        name="chinese_adr_cluster_cny_behavior",
+        tickers=("BABA", "PDD", "JD", "BIDU", "NIO"),
+        price=70.0,
+        shares=1_200_000_000,
+        units={"BABA": "CNY", "PDD": "CNY", "JD": "CNY", "NIO": "CNY"},
+        check=_check_chinese_adr,
+    ),
+]
+
+
+@pytest.mark.parametrize("cohort", _COHORTS, ids=lambda c: c.name)
+async def test_cohorts(run_analysis, cohort):
+    tickers = list(cohort.tickers)
+    units = {t: cohort.units.get(t, "USD") for t in tickers}
+    ltm = {
+        t: _query_result(t, _ltm_metrics(unit=units[t], **cohort.ltm_overrides(t))) for t in tickers
+    }
+    growth = {t: _query_result(t, _growth_metrics(unit=units[t]), period="ltm-1") for t in tickers}
+    market = _snapshots_for(tickers, cohort.price, cohort.shares)
 
+    results = await run_analysis(tickers, ltm, growth, market, ev_policy=cohort.ev_policy)
+
+    cohort.check(results)
 
-@pytest.mark.asyncio
-async def test_adr_market_cap_uses_vendor():
-    """ADR ticker should use vendor-reported market cap, not inflated price * shares."""
-    tickers = ["TSM"]
-    ltm = {"TSM": _query_result("TSM", _ltm_metrics(unit="TWD"))}
-    growth = {"TSM": _query_result("TSM", _growth_metrics(unit="TWD"), period="ltm-1")}
 
-    # Simulate ADR: ordinary shares are 25.9B but the ADR price is $200
-    # Vendor market cap is $950B (correct), computed would be $5.18T (wrong)
-    now = datetime(2026, 2, 17, 12, 0, tzinfo=UTC)
-    price_mv = MarketValue(
+# Simulate ADR: ordinary shares are 25.9B but the ADR price is $200
+# Vendor market cap is $950B (correct), computed would be $5.18T (wrong)
+_TSM_ADR_SNAPSHOT = MarketSnapshot.model_construct(
+    symbol="TSM",
+    company_name="TSM Corp",
+    price=MarketValue.model_construct(
         metric="price",
         value=200.0,
         unit="USD",
         vendor="finnhub",
         symbol="TSM",
         endpoint="quote",
-        fetched_at=now,
-    )
-    shares_mv = MarketValue(
+        fetched_at=_FIXED_NOW,
+    ),
+    shares_outstanding=MarketValue.model_construct(
         metric="shares_outstanding",
         value=25_900_000_000,
         unit="shares",
         vendor="finnhub",
         symbol="TSM",
         endpoint="profile",
-        fetched_at=now,
-    )
+        fetched_at=_FIXED_NOW,
+    ),
     # Vendor-reported market cap (not computed)
-    mcap_mv = MarketValue(
+    market_cap=MarketValue.model_construct(
         metric="market_cap",
         value=950_000_000_000,
         unit="USD",
         vendor="finnhub",
         symbol="TSM",
         endpoint="profile",
-        fetched_at=now,
+        fetched_at=_FIXED_NOW,
         notes=["Vendor-reported marketCapitalization=950000M from profile endpoint"],
-    )
-    market = {
-        "TSM": MarketSnapshot(
-            symbol="TSM",
-            company_name="TSM Corp",
-            price=price_mv,
-            shares_outstanding=shares_mv,
-            market_cap=mcap_mv,
-        )
-    }
-    results = await _run_analysis(tickers, ltm, growth, market)
+    ),
+)
+
+
+async def test_adr_market_cap_uses_vendor(run_analysis):
+    """ADR ticker should use vendor-reported market cap, not inflated price * shares."""
+    tickers = ["TSM"]
+    ltm = {"TSM": _query_result("TSM", _ltm_metrics(unit="TWD"))}
+    growth = {"TSM": _query_result("TSM", _growth_metrics(unit="TWD"), period="ltm-1")}
+    market = {"TSM": _TSM_ADR_SNAPSHOT}
+
+    results = await run_analysis(tickers, ltm, growth, market)
     tsm = results[0]
     # Market cap should be $950B, not $5.18T
     assert tsm.market.market_cap.value == 950_000_000_000
 
 
-@pytest.mark.asyncio
-async def test_captive_finance_debt():
+async def test_captive_finance_debt(run_analysis):
     """Ford-like company should resolve consolidated debt from broad XBRL tags."""
     tickers = ["F"]
     ltm = {
@@ -460,7 +530,7 @@ async def test_captive_finance_debt():
     growth = {"F": _query_result("F", _growth_metrics(), period="ltm-1")}
     market = {"F": _snapshot("F", price=12.0, shares=4_000_000_000)}
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+    results = await run_analysis(tickers, ltm, growth, market)
     f_result = results[0]
     assert f_result.ev_bridge is not None
     assert f_result.ev_bridge.enterprise_value.value is not None
@@ -469,8 +539,7 @@ async def test_captive_finance_debt():
     assert ev > 100_000_000_000  # EV > $100B given $160B debt
 
 
-@pytest.mark.asyncio
-async def test_annual_only_filer_growth():
+async def test_annual_only_filer_growth(run_analysis):
     """20-F filer with annual-only data should show non-zero YoY growth."""
     tickers = ["TSM"]
     # LTM for annual-only filer resolves to most recent FY
@@ -486,24 +555,16 @@ async def test_annual_only_filer_growth():
     growth = {
         "TSM": _query_result(
             "TSM",
-            {
-                "revenue": _cited(70_000_000_000, "revenue", "USD"),
-                "ebitda": _cited(5_000_000_000, "ebitda", "USD"),
-                "net_income": _cited(2_500_000_000, "net_income", "USD"),
-                "eps_diluted": _cited(2.0, "eps_diluted", "USD"),
-                "depreciation_amortization": _cited(
-                    900_000_000, "depreciation_amortization", "USD"
-                ),
-                "gross_profit": _cited(12_000_000_000, "gross_profit", "USD"),
-                "operating_income": _cited(4_500_000_000, "operating_income", "USD"),
-                "stock_based_compensation": _cited(400_000_000, "stock_based_compensation", "USD"),
-            },
+            _growth_metrics(
+                revenue=_cited(70_000_000_000, "revenue", "USD"),
+                cost_of_revenue=None,
+            ),
             period="ltm-1",
         ),
     }
     market = {"TSM": _snapshot("TSM", price=200.0, shares=5_000_000_000)}
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+    results = await run_analysis(tickers, ltm, growth, market)
     tsm = results[0]
     assert "revenue_yoy" in tsm.growth
     # Revenue grew from $70B to $90B = ~28.6% growth
@@ -511,8 +572,7 @@ async def test_annual_only_filer_growth():
     assert abs(tsm.growth["revenue_yoy"].value - (90 - 70) / 70) < 0.01
 
 
-@pytest.mark.asyncio
-async def test_bank_missing_gross_profit_tag():
+async def test_bank_missing_gross_profit_tag(run_analysis):
     """Bank/financial where GrossProfit XBRL tag is missing but revenue and COGS are present."""
     tickers = ["JPM"]
     ltm = {
@@ -527,7 +587,7 @@ async def test_bank_missing_gross_profit_tag():
     growth = {"JPM": _query_result("JPM", _growth_metrics(), period="ltm-1")}
     market = {"JPM": _snapshot("JPM", price=180.0, shares=2_800_000_000)}
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+    results = await run_analysis(tickers, ltm, growth, market)
     jpm = results[0]
 
     # gross_margin should still compute from revenue - cost_of_revenue
@@ -545,8 +605,7 @@ async def test_bank_missing_gross_profit_tag():
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_insurance_conglomerate_brk():
+async def test_insurance_conglomerate_brk(run_analysis):
     """BRK.B: massive float-as-liability, equity portfolio, no standard EBITDA."""
     tickers = ["BRK.B"]
     ltm = {
@@ -571,7 +630,7 @@ async def test_insurance_conglomerate_brk():
     growth = {"BRK.B": _query_result("BRK.B", _growth_metrics(), period="ltm-1")}
     market = {"BRK.B": _snapshot("BRK.B", price=500.0, shares=2_160_000_000)}
 
-    results = await _run_analysis(
+    results = await run_analysis(
         tickers,
         ltm,
         growth,
@@ -586,8 +645,7 @@ async def test_insurance_conglomerate_brk():
     assert brk.multiples["pe"].value is not None
 
 
-@pytest.mark.asyncio
-async def test_reit_depreciation_heavy():
+async def test_reit_depreciation_heavy(run_analysis):
     """PLD: REIT where depreciation distorts earnings. FFO is the real metric."""
     tickers = ["PLD"]
     ltm = {
@@ -609,7 +667,7 @@ async def test_reit_depreciation_heavy():
     growth = {"PLD": _query_result("PLD", _growth_metrics(), period="ltm-1")}
     market = {"PLD": _snapshot("PLD", price=120.0, shares=930_000_000)}
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+    results = await run_analysis(tickers, ltm, growth, market)
     pld = results[0]
     assert pld.errors == []
     assert pld.ev_bridge.enterprise_value.value is not None
@@ -618,8 +676,7 @@ async def test_reit_depreciation_heavy():
     assert pld.multiples["ev_ebitda"].value is not None
 
 
-@pytest.mark.asyncio
-async def test_mlp_partnership():
+async def test_mlp_partnership(run_analysis):
     """EPD: MLP with K-1 reporting, distributable cash flow."""
     tickers = ["EPD"]
     ltm = {
@@ -640,7 +697,7 @@ async def test_mlp_partnership():
     growth = {"EPD": _query_result("EPD", _growth_metrics(), period="ltm-1")}
     market = {"EPD": _snapshot("EPD", price=30.0, shares=2_170_000_000)}
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+    results = await run_analysis(tickers, ltm, growth, market)
     epd = results[0]
     assert epd.errors == []
     assert epd.ev_bridge.enterprise_value.value is not None
@@ -648,8 +705,7 @@ async def test_mlp_partnership():
     assert epd.multiples["dividend_yield"].value is not None
 
 
-@pytest.mark.asyncio
-async def test_bdc_nav_based():
+async def test_bdc_nav_based(run_analysis):
     """ARCC: BDC where unrealized gains dominate earnings."""
     tickers = ["ARCC"]
     ltm = {
@@ -670,7 +726,7 @@ async def test_bdc_nav_based():
     growth = {"ARCC": _query_result("ARCC", _growth_metrics(), period="ltm-1")}
     market = {"ARCC": _snapshot("ARCC", price=22.0, shares=620_000_000)}
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+    results = await run_analysis(tickers, ltm, growth, market)
     arcc = results[0]
     assert arcc.errors == []
     assert arcc.multiples["pe"].value is not None
@@ -679,8 +735,7 @@ async def test_bdc_nav_based():
     assert arcc.multiples["ev_ebitda"].value is None
 
 
-@pytest.mark.asyncio
-async def test_dual_class_share_structure():
+async def test_dual_class_share_structure(run_analysis):
     """GOOGL: three share classes complicate diluted share count."""
     tickers = ["GOOGL"]
     ltm = {
@@ -704,7 +759,7 @@ async def test_dual_class_share_structure():
     growth = {"GOOGL": _query_result("GOOGL", _growth_metrics(), period="ltm-1")}
     market = {"GOOGL": _snapshot("GOOGL", price=185.0, shares=12_300_000_000)}
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+    results = await run_analysis(tickers, ltm, growth, market)
     googl = results[0]
     assert googl.errors == []
     assert googl.multiples["pe"].value is not None
@@ -712,8 +767,7 @@ async def test_dual_class_share_structure():
     assert googl.multiples["ev_ebitda"].value is not None
 
 
-@pytest.mark.asyncio
-async def test_recent_spinoff_limited_history():
+async def test_recent_spinoff_limited_history(run_analysis):
     """GEV: < 2 years independent history, carve-out accounting."""
     tickers = ["GEV"]
     ltm = {
@@ -734,19 +788,23 @@ async def test_recent_spinoff_limited_history():
     growth = {
         "GEV": _query_result(
             "GEV",
-            {
-                "revenue": _cited(None, "revenue", "USD"),
-                "ebitda": _cited(None, "ebitda", "USD"),
-                "net_income": _cited(None, "net_income", "USD"),
-                "eps_diluted": _cited(None, "eps_diluted", "USD"),
-                "depreciation_amortization": _cited(None, "depreciation_amortization", "USD"),
-            },
+            _growth_metrics(
+                revenue=_cited(None, "revenue", "USD"),
+                ebitda=_cited(None, "ebitda", "USD"),
+                net_income=_cited(None, "net_income", "USD"),
+                eps_diluted=_cited(None, "eps_diluted", "USD"),
+                depreciation_amortization=_cited(None, "depreciation_amortization", "USD"),
+                cost_of_revenue=None,
+                gross_profit=None,
+                operating_income=None,
+                stock_based_compensation=None,
+            ),
             period="ltm-1",
         ),
     }
     market = {"GEV": _snapshot("GEV", price=400.0, shares=275_000_000)}
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+    results = await run_analysis(tickers, ltm, growth, market)
     gev = results[0]
     assert gev.errors == []
     assert gev.ev_bridge.enterprise_value.value is not None
@@ -754,8 +812,7 @@ async def test_recent_spinoff_limited_history():
     assert "revenue_yoy" not in gev.growth or gev.growth.get("revenue_yoy") is None
 
 
-@pytest.mark.asyncio
-async def test_shipping_cyclical_ebitda():
+async def test_shipping_cyclical_ebitda(run_analysis):
     """ZIM: massive EBITDA swings, drydocking capex, vessel impairments."""
     tickers = ["ZIM"]
     ltm = {
@@ -774,13 +831,14 @@ async def test_shipping_cyclical_ebitda():
         )
     }
     # Prior year had much lower EBITDA (cyclical)
-    growth_metrics = _growth_metrics()
-    growth_metrics["ebitda"] = _cited(1_500_000_000, "ebitda", "USD")
-    growth_metrics["net_income"] = _cited(500_000_000, "net_income", "USD")
+    growth_metrics = _growth_metrics(
+        ebitda=_cited(1_500_000_000, "ebitda", "USD"),
+        net_income=_cited(500_000_000, "net_income", "USD"),
+    )
     growth = {"ZIM": _query_result("ZIM", growth_metrics, period="ltm-1")}
     market = {"ZIM": _snapshot("ZIM", price=25.0, shares=120_000_000)}
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+    results = await run_analysis(tickers, ltm, growth, market)
     zim = results[0]
     assert zim.errors == []
     assert zim.multiples["ev_ebitda"].value is not None
@@ -789,8 +847,7 @@ async def test_shipping_cyclical_ebitda():
     assert zim.growth["ebitda_yoy"].value > 1.0
 
 
-@pytest.mark.asyncio
-async def test_mining_commodity():
+async def test_mining_commodity(run_analysis):
     """FCX: commodity sensitivity, impairment risk."""
     tickers = ["FCX"]
     ltm = {
@@ -810,7 +867,7 @@ async def test_mining_commodity():
     growth = {"FCX": _query_result("FCX", _growth_metrics(), period="ltm-1")}
     market = {"FCX": _snapshot("FCX", price=45.0, shares=1_440_000_000)}
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+    results = await run_analysis(tickers, ltm, growth, market)
     fcx = results[0]
     assert fcx.errors == []
     assert fcx.ev_bridge.enterprise_value.value is not None
@@ -818,20 +875,17 @@ async def test_mining_commodity():
     assert fcx.multiples["pe"].value is not None
 
 
-@pytest.mark.asyncio
-async def test_bank_pair_jpm_wfc():
+async def test_bank_pair_jpm_wfc(run_analysis):
     """JPM + WFC: interest income, provisions, bank-specific leverage."""
     tickers = ["JPM", "WFC"]
-    ltm = {}
-    growth = {}
-    market = {}
-
-    for ticker, (price, shares, rev, ni) in {
+    # ticker -> (price, shares, revenue, net income)
+    inputs = {
         "JPM": (220.0, 2_800_000_000, 175_000_000_000, 55_000_000_000),
         "WFC": (65.0, 3_600_000_000, 82_000_000_000, 18_000_000_000),
-    }.items():
-        ltm[ticker] = _query_result(
-            ticker,
+    }
+    ltm = {
+        t: _query_result(
+            t,
             _ltm_metrics(
                 revenue=_cited(rev, "revenue", "USD"),
                 net_income=_cited(ni, "net_income", "USD"),
@@ -843,10 +897,15 @@ async def test_bank_pair_jpm_wfc():
                 stockholders_equity=_cited(320_000_000_000, "stockholders_equity", "USD"),
             ),
         )
-        growth[ticker] = _query_result(ticker, _growth_metrics(), period="ltm-1")
-        market[ticker] = _snapshot(ticker, price=price, shares=shares)
+        for t, (_price, _shares, rev, ni) in inputs.items()
+    }
+    growth = {t: _query_result(t, _growth_metrics(), period="ltm-1") for t in tickers}
+    market = {
+        t: _snapshot(t, price=price, shares=shares)
+        for t, (price, shares, _rev, _ni) in inputs.items()
+    }
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+    results = await run_analysis(tickers, ltm, growth, market)
     for result in results:
         assert result.errors == []
         assert result.multiples["pe"].value is not None
@@ -855,42 +914,39 @@ async def test_bank_pair_jpm_wfc():
         assert result.multiples["ev_ebitda"].value is None
 
 
-@pytest.mark.asyncio
-async def test_brazilian_adr_pbr():
+async def test_brazilian_adr_pbr(run_analysis):
     """PBR: BRL currency, commodity + FX double exposure."""
     tickers = ["PBR"]
     ltm = {"PBR": _query_result("PBR", _ltm_metrics(unit="BRL"))}
     growth = {"PBR": _query_result("PBR", _growth_metrics(unit="BRL"), period="ltm-1")}
     market = {"PBR": _snapshot("PBR", price=14.0, shares=6_300_000_000)}
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+    results = await run_analysis(tickers, ltm, growth, market)
     pbr = results[0]
     assert pbr.errors == []
     # EV should be None due to BRL/USD currency mismatch
     assert pbr.ev_bridge.enterprise_value.value is None
-    assert any("cannot mix currencies" in w for w in pbr.ev_bridge.enterprise_value.warnings)
+    assert any(CURRENCY_MISMATCH in w for w in pbr.ev_bridge.enterprise_value.warnings)
     # Operating ratios should still work (same-currency numerator/denominator)
     assert "rd_pct_revenue" in pbr.operating
 
 
-@pytest.mark.asyncio
-async def test_japanese_adr_hmc():
+async def test_japanese_adr_hmc(run_analysis):
     """HMC: JPY currency, March FY end."""
     tickers = ["HMC"]
     ltm = {"HMC": _query_result("HMC", _ltm_metrics(unit="JPY"))}
     growth = {"HMC": _query_result("HMC", _growth_metrics(unit="JPY"), period="ltm-1")}
     market = {"HMC": _snapshot("HMC", price=35.0, shares=1_700_000_000)}
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+    results = await run_analysis(tickers, ltm, growth, market)
     hmc = results[0]
     assert hmc.errors == []
     # EV should be None due to JPY/USD currency mismatch
     assert hmc.ev_bridge.enterprise_value.value is None
-    assert any("cannot mix currencies" in w for w in hmc.ev_bridge.enterprise_value.warnings)
+    assert any(CURRENCY_MISMATCH in w for w in hmc.ev_bridge.enterprise_value.warnings)
 
 
-@pytest.mark.asyncio
-async def test_pre_profit_ev_rivn():
+async def test_pre_profit_ev_rivn(run_analysis):
     """RIVN: deep losses, negative PE throughout."""
     tickers = ["RIVN"]
     ltm = {
@@ -910,17 +966,16 @@ async def test_pre_profit_ev_rivn():
     growth = {"RIVN": _query_result("RIVN", _growth_metrics(), period="ltm-1")}
     market = {"RIVN": _snapshot("RIVN", price=15.0, shares=1_000_000_000)}
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+    results = await run_analysis(tickers, ltm, growth, market)
     rivn = results[0]
     assert rivn.errors == []
     assert rivn.multiples["pe"].value is not None
     assert rivn.multiples["pe"].value < 0
-    assert any("Negative denominator" in w for w in rivn.multiples["pe"].warnings)
+    assert any(NEGATIVE_DENOMINATOR in w for w in rivn.multiples["pe"].warnings)
     assert rivn.multiples["ev_revenue"].value is not None
 
 
-@pytest.mark.asyncio
-async def test_saas_high_sbc_ddog():
+async def test_saas_high_sbc_ddog(run_analysis):
     """DDOG: SBC-heavy SaaS, adjusted vs GAAP EBITDA gap."""
     tickers = ["DDOG"]
     ltm = {
@@ -944,7 +999,7 @@ async def test_saas_high_sbc_ddog():
     growth = {"DDOG": _query_result("DDOG", _growth_metrics(), period="ltm-1")}
     market = {"DDOG": _snapshot("DDOG", price=130.0, shares=330_000_000)}
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+    results = await run_analysis(tickers, ltm, growth, market)
     ddog = results[0]
     assert ddog.errors == []
     assert ddog.multiples["ev_ebitda"].value is not None
@@ -956,8 +1011,7 @@ async def test_saas_high_sbc_ddog():
         assert adj > gaap
 
 
-@pytest.mark.asyncio
-async def test_negative_equity_sbux():
+async def test_negative_equity_sbux(run_analysis):
     """SBUX: negative equity from aggressive buybacks."""
     tickers = ["SBUX"]
     ltm = {
@@ -974,17 +1028,16 @@ async def test_negative_equity_sbux():
     growth = {"SBUX": _query_result("SBUX", _growth_metrics(), period="ltm-1")}
     market = {"SBUX": _snapshot("SBUX", price=100.0, shares=1_100_000_000)}
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+    results = await run_analysis(tickers, ltm, growth, market)
     sbux = results[0]
     assert sbux.errors == []
     assert sbux.multiples["price_book"].value < 0
-    assert any("Negative denominator" in w for w in sbux.multiples["price_book"].warnings)
+    assert any(NEGATIVE_DENOMINATOR in w for w in sbux.multiples["price_book"].warnings)
     # EV should still be computable
     assert sbux.ev_bridge.enterprise_value.value is not None
 
 
-@pytest.mark.asyncio
-async def test_ford_captive_finance_low_debt():
+async def test_ford_captive_finance_low_debt(run_analysis):
     """Ford: low resolved debt vs high liabilities. EV computed but debt is suspect."""
     tickers = ["F"]
     ltm = {
@@ -1002,7 +1055,7 @@ async def test_ford_captive_finance_low_debt():
     growth = {"F": _query_result("F", _growth_metrics(), period="ltm-1")}
     market = {"F": _snapshot("F", price=12.0, shares=4_000_000_000)}
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+    results = await run_analysis(tickers, ltm, growth, market)
     f_result = results[0]
     assert f_result.errors == []
     assert f_result.ev_bridge.enterprise_value.value is not None
@@ -1010,8 +1063,7 @@ async def test_ford_captive_finance_low_debt():
     assert f_result.ev_bridge.net_debt.value < 0
 
 
-@pytest.mark.asyncio
-async def test_consumer_tech_aapl_large_buyback():
+async def test_consumer_tech_aapl_large_buyback(run_analysis):
     """AAPL: Sep FY, massive buybacks, huge operating leverage."""
     tickers = ["AAPL"]
     ltm = {
@@ -1034,7 +1086,7 @@ async def test_consumer_tech_aapl_large_buyback():
     growth = {"AAPL": _query_result("AAPL", _growth_metrics(), period="ltm-1")}
     market = {"AAPL": _snapshot("AAPL", price=230.0, shares=15_000_000_000)}
 
-    results = await _run_analysis(tickers, ltm, growth, market)
+    results = await run_analysis(tickers, ltm, growth, market)
     aapl = results[0]
     assert aapl.errors == []
     assert aapl.ev_bridge.enterprise_value.value is not None
@@ -1,45 +1,52 @@
 """Tests for shared utility functions: cross-check, compute_gross_profit, compute_free_cash_flow."""
 
-from types import SimpleNamespace
+from dataclasses import dataclass
+
+import pytest
 
 from handspread.analysis._utils import (
+    CROSS_CHECK_DIVERGENCE,
     _cross_check,
     compute_free_cash_flow,
     compute_gross_profit,
 )
 
 
-def _cited(value, metric="test", unit=None, concept=None):
-    return SimpleNamespace(value=value, metric=metric, unit=unit, concept=concept)
-
-
-class TestCrossCheck:
-    def test_within_tolerance(self):
-        assert _cross_check(1000, 1005, "metric") is None
-
-    def test_exceeds_tolerance(self):
-        result = _cross_check(1000, 1100, "metric")
-        assert result is not None
-        assert "metric" in result
-        assert "differs from reported" in result
+@dataclass(frozen=True, slots=True)
+class _Cited:
+    """Stub CitedValue: cross-check warnings also read .concept for tag detail."""
 
-    def test_none_computed(self):
-        assert _cross_check(None, 1000, "metric") is None
+    value: float | None
+    metric: str = "test"
+    unit: str | None = None
+    concept: str | None = None
 
-    def test_none_reported(self):
-        assert _cross_check(1000, None, "metric") is None
 
-    def test_zero_reported(self):
-        assert _cross_check(1000, 0, "metric") is None
+def _cited(value, metric="test", unit=None, concept=None):
+    return _Cited(value, metric, unit, concept)
 
-    def test_exact_match(self):
-        assert _cross_check(1000, 1000, "metric") is None
 
-    def test_custom_tolerance(self):
-        # 5% diff, default 1% tolerance would flag it
-        assert _cross_check(1000, 1050, "metric", tolerance=0.01) is not None
-        # But 10% tolerance should pass
-        assert _cross_check(1000, 1050, "metric", tolerance=0.10) is None
+class TestCrossCheck:
+    @pytest.mark.parametrize(
+        "computed,reported,kwargs,expect_warning",
+        [
+            pytest.param(1000, 1005, {}, False, id="within_tolerance"),
+            pytest.param(1000, 1100, {}, True, id="exceeds_tolerance"),
+            pytest.param(None, 1000, {}, False, id="none_computed"),
+            pytest.param(1000, None, {}, False, id="none_reported"),
+            pytest.param(1000, 0, {}, False, id="zero_reported"),
+            pytest.param(1000, 1000, {}, False, id="exact_match"),
+            # 5% diff: the default 1% tolerance flags it, 10% lets it pass
+            pytest.param(1000, 1050, {"tolerance": 0.01}, True, id="tight_tolerance"),
+            pytest.param(1000, 1050, {"tolerance": 0.10}, False, id="loose_tolerance"),
+        ],
+    )
+    def test_cross_check(self, computed, reported, kwargs, expect_warning):
+        result = _cross_check(computed, reported, "metric", **kwargs)
+        assert (result is not None) == expect_warning
+        if expect_warning:
+            assert "metric" in result
+            assert CROSS_CHECK_DIVERGENCE in result
 
 
 class TestComputeGrossProfit:
@@ -48,7 +55,7 @@ class TestComputeGrossProfit:
             "revenue": _cited(1_000_000),
             "cost_of_revenue": _cited(400_000),
         }
-        val, cv, warnings = compute_gross_profit(sec)
+        val, cv, _ = compute_gross_profit(sec)
         assert val == 600_000
         assert cv.value == 600_000
         assert cv.metric == "gross_profit"
@@ -56,15 +63,22 @@ class TestComputeGrossProfit:
         assert "revenue" in cv.components
         assert "cost_of_revenue" in cv.components
 
-    def test_cross_check_warning_when_divergent(self):
+    @pytest.mark.parametrize(
+        "reported,expect_warning",
+        [
+            pytest.param(500_000, True, id="divergent"),  # reported differs from 600k computed
+            pytest.param(600_000, False, id="matching"),
+        ],
+    )
+    def test_cross_check_against_reported(self, reported, expect_warning):
         sec = {
             "revenue": _cited(1_000_000),
             "cost_of_revenue": _cited(400_000),
-            "gross_profit": _cited(500_000),  # reported differs from 600k computed
+            "gross_profit": _cited(reported),
         }
         val, cv, warnings = compute_gross_profit(sec)
         assert val == 600_000
-        assert any("differs from reported" in w for w in warnings)
+        assert any(CROSS_CHECK_DIVERGENCE in w for w in warnings) == expect_warning
 
     def test_cross_check_warning_includes_concepts(self):
         sec = {
@@ -74,21 +88,11 @@ class TestComputeGrossProfit:
         }
         val, cv, warnings = compute_gross_profit(sec)
         assert val == 600_000
-        divergent = [w for w in warnings if "differs from reported" in w]
+        divergent = [w for w in warnings if CROSS_CHECK_DIVERGENCE in w]
         assert len(divergent) == 1
         assert "CostOfGoodsAndServicesSold" in divergent[0]
         assert "GrossProfit" in divergent[0]
 
-    def test_cross_check_no_warning_when_matching(self):
-        sec = {
-            "revenue": _cited(1_000_000),
-            "cost_of_revenue": _cited(400_000),
-            "gross_profit": _cited(600_000),
-        }
-        val, cv, warnings = compute_gross_profit(sec)
-        assert val == 600_000
-        assert not any("differs from reported" in w for w in warnings)
-
     def test_fallback_to_reported(self):
         sec = {
             "revenue": _cited(1_000_000),
@@ -98,18 +102,15 @@ class TestComputeGrossProfit:
         assert val == 600_000
         assert any("pass-through" in w or "reported" in w.lower() for w in warnings)
 
-    def test_both_missing_returns_none(self):
-        sec = {"revenue": _cited(1_000_000)}
-        val, cv, warnings = compute_gross_profit(sec)
-        assert val is None
-        assert cv is None
-        assert warnings == []
-
-    def test_empty_metrics_returns_none(self):
-        val, cv, warnings = compute_gross_profit({})
-        assert val is None
-        assert cv is None
-        assert warnings == []
+    @pytest.mark.parametrize(
+        "sec",
+        [
+            pytest.param({"revenue": _cited(1_000_000)}, id="both_missing"),
+            pytest.param({}, id="empty_metrics"),
+        ],
+    )
+    def test_missing_inputs_return_none(self, sec):
+        assert compute_gross_profit(sec) == (None, None, [])
 
 
 class TestComputeFreeCashFlow:
@@ -118,7 +119,7 @@ class TestComputeFreeCashFlow:
             "operating_cash_flow": _cited(5_000_000),
             "capex": _cited(1_500_000),
         }
-        val, cv, warnings = compute_free_cash_flow(sec)
+        val, cv, _ = compute_free_cash_flow(sec)
         assert val == 3_500_000
         assert cv.value == 3_500_000
         assert cv.metric == "free_cash_flow"
@@ -126,15 +127,22 @@ class TestComputeFreeCashFlow:
         assert "operating_cash_flow" in cv.components
         assert "capex" in cv.components
 
-    def test_cross_check_warning_when_divergent(self):
+    @pytest.mark.parametrize(
+        "reported,expect_warning",
+        [
+            pytest.param(2_000_000, True, id="divergent"),  # reported differs from 3.5M computed
+            pytest.param(3_500_000, False, id="matching"),
+        ],
+    )
+    def test_cross_check_against_reported(self, reported, expect_warning):
         sec = {
             "operating_cash_flow": _cited(5_000_000),
             "capex": _cited(1_500_000),
-            "free_cash_flow": _cited(2_000_000),  # reported differs from 3.5M computed
+            "free_cash_flow": _cited(reported),
         }
         val, cv, warnings = compute_free_cash_flow(sec)
         assert val == 3_500_000
-        assert any("differs from reported" in w for w in warnings)
+        assert any(CROSS_CHECK_DIVERGENCE in w for w in warnings) == expect_warning
 
     def test_cross_check_warning_includes_concepts(self):
         sec = {
@@ -144,22 +152,12 @@ class TestComputeFreeCashFlow:
         }
         val, cv, warnings = compute_free_cash_flow(sec)
         assert val == 3_500_000
-        divergent = [w for w in warnings if "differs from reported" in w]
+        divergent = [w for w in warnings if CROSS_CHECK_DIVERGENCE in w]
         assert len(divergent) == 1
         assert "NetCashFromOperating" in divergent[0]
         assert "PaymentsForCapitalExpenditures" in divergent[0]
         assert "FreeCashFlow" in divergent[0]
 
-    def test_cross_check_no_warning_when_matching(self):
-        sec = {
-            "operating_cash_flow": _cited(5_000_000),
-            "capex": _cited(1_500_000),
-            "free_cash_flow": _cited(3_500_000),
-        }
-        val, cv, warnings = compute_free_cash_flow(sec)
-        assert val == 3_500_000
-        assert not any("differs from reported" in w for w in warnings)
-
     def test_fallback_to_derived(self):
         sec = {
             "free_cash_flow": _cited(3_500_000),
@@ -168,15 +166,12 @@ class TestComputeFreeCashFlow:
         assert val == 3_500_000
         assert any("pass-through" in w or "derived" in w.lower() for w in warnings)
 
-    def test_both_missing_returns_none(self):
-        sec = {"operating_cash_flow": _cited(5_000_000)}
-        val, cv, warnings = compute_free_cash_flow(sec)
-        assert val is None
-        assert cv is None
-        assert warnings == []
-
-    def test_empty_metrics_returns_none(self):
-        val, cv, warnings = compute_free_cash_flow({})
-        assert val is None
-        assert cv is None
-        assert warnings == []
+    @pytest.mark.parametrize(
+        "sec",
+        [
+            pytest.param({"operating_cash_flow": _cited(5_000_000)}, id="both_missing"),
+            pytest.param({}, id="empty_metrics"),
+        ],
+    )
+    def test_missing_inputs_return_none(self, sec):
+        assert compute_free_cash_flow(sec) == (None, None, [])